@@ -6,13 +6,28 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
 import io
+import os
+import re
+import json
+import time
+import hashlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from sklearn.neighbors import KDTree
 import folium
 from streamlit_folium import st_folium
 
 from urllib.parse import quote_plus
 
+import geocode_cache
+import address_index
+from memory_cache import BoundedLRU
+
 KAKAO_API_KEY = st.secrets["KAKAO_API"]["KEY"]
 JS_KEY = st.secrets["KAKAO_API"]["JS_KEY"]
 
@@ -47,14 +62,75 @@ dong_coords = {
 
 default_coords = ("36.991", "127.925")  # 충주시청 기준
 
+# ─────────────────────────────────────────────
+# ✅ 카카오 API 호출 공통부
+#    - keep-alive 연결 풀 세션 1개를 전체 스레드가 공유 (동시 일괄 변환 수 × 배치 스레드 수만큼 연결 유지)
+#    - 토큰 버킷으로 초당 호출 수 제한 (카카오 쿼터 기준), 429/5xx·연결 오류는 지수 백오프 후 재시도
+# ─────────────────────────────────────────────
+KAKAO_REQUESTS_PER_SEC = 10      # 카카오 로컬 API 허용 호출 속도에 맞춤
+KAKAO_MAX_RETRIES = 4
+KAKAO_BACKOFF_SEC = 0.5
+KAKAO_TIMEOUT_SEC = 5
+BATCH_WORKERS = 4
+MAX_CONCURRENT_BATCHES = 4       # 여러 세션의 동시 일괄 변환 상한 (호출 속도는 토큰 버킷이 전체 공유)
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    # 토큰 1개를 얻을 때까지 대기
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_rate_limiter = TokenBucket(KAKAO_REQUESTS_PER_SEC)
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=BATCH_WORKERS * MAX_CONCURRENT_BATCHES))
+_batch_slots = threading.BoundedSemaphore(MAX_CONCURRENT_BATCHES)
+
+def _retry_delay(attempt, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return KAKAO_BACKOFF_SEC * (2 ** attempt) * (1 + random.random() * 0.5)
+
+def kakao_get(url, params):
+    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
+    for attempt in range(KAKAO_MAX_RETRIES + 1):
+        _rate_limiter.acquire()
+        try:
+            r = _session.get(url, headers=headers, params=params, timeout=KAKAO_TIMEOUT_SEC)
+        except requests.RequestException:
+            if attempt == KAKAO_MAX_RETRIES:
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        if (r.status_code == 429 or r.status_code >= 500) and attempt < KAKAO_MAX_RETRIES:
+            time.sleep(_retry_delay(attempt, r))
+            continue
+        return r
+
 # ─────────────────────────────────────────────
 # ✅ 카카오 API 함수
 # ─────────────────────────────────────────────
 def get_coords_from_kakao(address):
     url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
-    params = {"query": address}
-    r = requests.get(url, headers=headers, params=params)
+    try:
+        r = kakao_get(url, {"query": address})
+    except requests.RequestException as e:
+        return {"위도": None, "경도": None, "정확도": "", "오류": f"API 오류({type(e).__name__})"}
     if r.status_code == 200:
         docs = r.json()["documents"]
         if docs:
@@ -64,16 +140,106 @@ def get_coords_from_kakao(address):
         return {"위도": None, "경도": None, "정확도": "", "오류": "주소 없음"}
     return {"위도": None, "경도": None, "정확도": "", "오류": f"API 오류({r.status_code})"}
 
+# ─────────────────────────────────────────────
+# ✅ 주소 정규화: 같은 주소의 표기 차이를 하나의 키로 통합 (캐시 키 + 파일 내 중복 제거)
+#    - 공백/쉼표 정리, 괄호 참고항목 제거, 시도 약칭 → 정식 명칭 (충북 → 충청북도)
+#    - "번지" 제거, 도로명(로/길 + 건물번호)·지번(동/리/가 + 번지) 뒤의 건물명·층·호수 제거
+# ─────────────────────────────────────────────
+REFERENCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference")
+REGION_REFERENCE_PATH = os.path.join(REFERENCE_DIR, "region_bbox.json")
+
+with open(REGION_REFERENCE_PATH, encoding="utf-8") as f:
+    REGION_REFERENCE = json.load(f)
+SIDO_SHORT = REGION_REFERENCE["시도약칭"]
+
+BRACKET_RE = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+LOT_SUFFIX_RE = re.compile(r"(\d+(?:-\d+)?)\s*번지")
+ADDRESS_END_RE = re.compile(r"^(.*?(?:[로길]|[동리가]\s+(?:산\s*)?)\s*\d+(?:-\d+)?)(?=$|[\s,])")
+
+def normalize_address(address):
+    if address is None or (isinstance(address, float) and pd.isna(address)):
+        return ""
+    text = BRACKET_RE.sub(" ", str(address))
+    text = LOT_SUFFIX_RE.sub(r"\1", text)
+    tokens = text.replace(",", " ").split()
+    if not tokens:
+        return ""
+    tokens[0] = SIDO_SHORT.get(tokens[0], tokens[0])
+    text = " ".join(tokens)
+    match = ADDRESS_END_RE.match(text)
+    return match.group(1) if match else text
+
+# ✅ 캐시 키 = 정규화 주소
+def address_key(address):
+    return normalize_address(address)
+
+# ✅ 파일 내 주소를 정규화 키로 묶음 → (고유 키 목록, 행별 고유 키 번호)
+def group_addresses(addresses):
+    keys = [normalize_address(addr) for addr in addresses]
+    codes, uniques = pd.factorize(pd.Series(keys, dtype=object), sort=False)
+    return list(uniques), codes
+
+# ✅ 주소 → 좌표 최종 결과: 정규화 키로 조회 후, 좌표를 못 찾으면 원문 주소로 대표좌표 보정
 def get_coords_with_fallback(address):
+    result = resolve_address(address)
+    if result["위도"] or not address_key(address):
+        return result
+    return representative_coords(address, result)
+
+# ✅ 정규화 키 기준 조회: 로컬 주소 색인(정확 일치 → 인근번지) → 캐시 → 카카오 순
+#    좌표를 못 찾은 결과도 캐시 (재조회 없이 원문 기준 대표좌표 보정). API 오류가 섞인 결과는 캐시하지 않음
+def resolve_address(address):
+    key = address_key(address)
+    if not key:
+        return {"위도": None, "경도": None, "정확도": "", "오류": "주소 없음"}
+    if address_index.index_size() > 0:
+        local = address_index.lookup_exact(key) or address_index.lookup_nearest(key)
+        if local:
+            return local
+    cached = geocode_cache.get_forward(key)
+    if cached:
+        return cached
+    api_errors = []
+    result = _geocode_with_fallback(key, api_errors)
+    if api_errors:
+        result["API오류"] = api_errors[-1]   # 대표좌표로 대체되더라도 재시도 대상임을 표시
+    else:
+        geocode_cache.put_forward(key, result)
+    return result
+
+# ✅ 3차·4차 보정은 원문 주소 기준 (정규화 시 지워지는 괄호 속 행정동도 사용)
+def representative_coords(address, result=None):
+    text = str(address)
+    extra = {"API오류": result["API오류"]} if result and result.get("API오류") else {}
+    # 3차: 행정동 기반 좌표 보정
+    for dong, (lat, lon) in dong_coords.items():
+        if dong in text:
+            return {"위도": lat, "경도": lon, "정확도": "행정동 대표좌표", "오류": "", **extra}
+
+    # 4차: 시군구 중심 좌표
+    lat, lon = default_coords
+    return {"위도": lat, "경도": lon, "정확도": "시군구 대표좌표", "오류": "", **extra}
+
+# ✅ API 오류가 섞인 결과 (캐시·체크포인트에 남기지 않고 다음 실행에서 재시도)
+def is_api_failure(result):
+    return bool(result.get("API오류")) or str(result.get("오류") or "").startswith("API 오류")
+
+def _geocode_with_fallback(address, api_errors):
+    def lookup(addr):
+        r = get_coords_from_kakao(addr)
+        if r["오류"].startswith("API 오류"):
+            api_errors.append(r["오류"])
+        return r
+
     # 1차: 전체 주소로 시도
-    result = get_coords_from_kakao(address)
+    result = lookup(address)
     if result["위도"]:
         result["정확도"] = "정좌표"
         return result
 
-    # 2차: 진짜 인근번지 보정 시도 (예: 31-3 → 31-2 → 31)
-    import re
-    match = re.search(r"(\d+)-(\d+)", address)
+    # 2차: 인근번지 보정. 로컬 색인이 있으면 resolve_address에서 이미 색인으로 찾았으므로
+    #      색인이 없을 때만 부번을 줄여 가며 API 재조회 (예: 31-3 → 31-2 → 31)
+    match = None if address_index.index_size() > 0 else re.search(r"(\d+)-(\d+)", address)
     if match:
         base = int(match.group(1))
         sub = int(match.group(2))
@@ -82,30 +248,38 @@ def get_coords_with_fallback(address):
             if new_sub < 0:
                 break
             new_addr = re.sub(r"\d+-\d+", f"{base}-{new_sub}", address)
-            result = get_coords_from_kakao(new_addr)
+            result = lookup(new_addr)
             if result["위도"]:
                 result["정확도"] = f"인근번지 보정({base}-{new_sub})"
                 return result
         # 단일번지로 재시도
-        result = get_coords_from_kakao(address.replace(f"{base}-{sub}", str(base)))
+        result = lookup(address.replace(f"{base}-{sub}", str(base)))
         if result["위도"]:
             result["정확도"] = f"인근번지 보정({base})"
             return result
 
-    # 3차: 행정동 기반 좌표 보정
-    for dong, (lat, lon) in dong_coords.items():
-        if dong in address:
-            return {"위도": lat, "경도": lon, "정확도": "행정동 대표좌표", "오류": ""}
-
-    # 4차: 시군구 중심 좌표
-    lat, lon = default_coords
-    return {"위도": lat, "경도": lon, "정확도": "시군구 대표좌표", "오류": ""}
+    # 좌표 없음 → 대표좌표 보정은 representative_coords에서 원문 주소로
+    return {"위도": None, "경도": None, "정확도": "", "오류": "주소 없음"}
 
+# ✅ 좌표 → 주소: 약 1m 단위 캐시 우선, API 오류는 캐시하지 않음
 def get_address_from_kakao(lat, lon):
+    cached = geocode_cache.get_reverse(lat, lon)
+    if cached:
+        return cached
+    result = _reverse_geocode(lat, lon)
+    if not result["오류"].startswith("API 오류"):
+        try:
+            geocode_cache.put_reverse(lat, lon, result)
+        except (TypeError, ValueError):
+            pass
+    return result
+
+def _reverse_geocode(lat, lon):
     url = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
-    params = {"x": lon, "y": lat}
-    r = requests.get(url, headers=headers, params=params)
+    try:
+        r = kakao_get(url, {"x": lon, "y": lat})
+    except requests.RequestException as e:
+        return {"지번주소": None, "도로명주소": None, "오류": f"API 오류({type(e).__name__})"}
 
     if r.status_code == 200:
         data = r.json()
@@ -225,6 +399,9 @@ def handle_single_coords_to_address():
 
     if st.button("주소 조회", key="btn_convert_coord"):
         res = get_address_from_kakao(lat, lon)
+        local = assign_dongs([lat], [lon]).iloc[0]
+        if local["행정동"]:
+            st.caption(f"🧭 행정동(로컬 판정, {local['판정방식']}): {local['행정동']} · 시청에서 {local['시청거리(km)']:.2f}km")
 
         jibun = res.get("지번주소", "")
         road = res.get("도로명주소", "")
@@ -248,6 +425,202 @@ def handle_single_coords_to_address():
         draw_folium_map(st.session_state["last_lat"], st.session_state["last_lon"])
         st.info(st.session_state.get("coord_msg", ""))
 
+# ─────────────────────────────────────────────
+# ✅ 로컬 공간 색인: 행정동 판정 + 시청 거리 (API 호출 없음, 좌표 배열 단위 일괄 처리)
+#    - 행정동 경계 GeoJSON이 있으면 경계 포함 판정, 경계 밖이거나 파일이 없으면 최근접 행정동 중심 (KD-트리)
+#    - KD-트리는 시청 기준 평면(km) 근사 좌표 사용 (시 단위 범위에서는 오차 무시 가능), 거리는 대원거리
+#    - 충주시 범위(region_bbox.json) 밖이거나 가장 가까운 중심도 너무 멀면 행정동을 정하지 않음
+# ─────────────────────────────────────────────
+DONG_BOUNDARY_PATH = os.path.join(REFERENCE_DIR, "chungju_dong_boundary.geojson")
+CITY_HALL = tuple(float(v) for v in default_coords)
+CITY_BBOX = REGION_REFERENCE["시군구"]["충청북도 충주시"]    # [최소위도, 최대위도, 최소경도, 최대경도]
+CITY_BBOX_MARGIN_DEG = 0.03
+NEAREST_DONG_MAX_KM = 12.0
+EARTH_RADIUS_KM = 6371.0
+PIP_CHUNK_POINTS = 2000
+
+_spatial_index = {}
+_spatial_lock = threading.Lock()
+
+def _project_km(lat, lon):
+    x = (lon - CITY_HALL[1]) * 111.320 * np.cos(np.radians(CITY_HALL[0]))
+    y = (lat - CITY_HALL[0]) * 110.574
+    return np.column_stack([x, y])
+
+def haversine_km(lat, lon, lat0, lon0):
+    lat, lon, lat0, lon0 = map(np.radians, (lat, lon, lat0, lon0))
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat) * np.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+# ✅ GeoJSON 행정동 경계 → [(행정동명, 경계 변 배열 x1,y1,x2,y2, bbox)]
+#    이름은 adm_nm("충청북도 충주시 교현동") 등의 마지막 단어, 구멍(내부 고리)은 홀짝 규칙으로 처리
+def _load_dong_polygons(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        features = json.load(f).get("features", [])
+    polygons = []
+    for feature in features:
+        props, geometry = feature.get("properties") or {}, feature.get("geometry") or {}
+        name = str(props.get("adm_nm") or props.get("행정동") or props.get("name") or "").split()
+        if not name or geometry.get("type") not in ("Polygon", "MultiPolygon"):
+            continue
+        parts = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        rings = [np.asarray(ring, dtype=float)[:, :2] for part in parts for ring in part]
+        start = np.concatenate(rings)
+        end = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+        edges = (start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+        bbox = (start[:, 0].min(), start[:, 1].min(), start[:, 0].max(), start[:, 1].max())
+        polygons.append((name[-1], edges, bbox))
+    return polygons
+
+def get_spatial_index():
+    mtime = os.path.getmtime(DONG_BOUNDARY_PATH) if os.path.exists(DONG_BOUNDARY_PATH) else None
+    with _spatial_lock:
+        if not _spatial_index or _spatial_index["mtime"] != mtime:
+            names = list(dong_coords)
+            centroids = np.array([[float(lat), float(lon)] for lat, lon in dong_coords.values()])
+            _spatial_index.update(
+                mtime=mtime,
+                names=np.array(names, dtype=object),
+                centroids=centroids,
+                tree=KDTree(_project_km(centroids[:, 0], centroids[:, 1])),
+                polygons=_load_dong_polygons(DONG_BOUNDARY_PATH),
+            )
+        return _spatial_index
+
+def _points_in_polygon(lon, lat, edges):
+    x1, y1, x2, y2 = edges
+    inside = np.zeros(len(lon), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(lon), PIP_CHUNK_POINTS):
+            px = lon[start:start + PIP_CHUNK_POINTS, None]
+            py = lat[start:start + PIP_CHUNK_POINTS, None]
+            crosses = ((y1 > py) != (y2 > py)) & (px < (x2 - x1) * (py - y1) / (y2 - y1) + x1)
+            inside[start:start + PIP_CHUNK_POINTS] = crosses.sum(axis=1) % 2 == 1
+    return inside
+
+# ✅ 좌표 배열 → 행정동 / 판정방식 / 중심거리(km) / 시청거리(km)
+def assign_dongs(lats, lons):
+    lat = pd.to_numeric(pd.Series(lats, dtype=object), errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(pd.Series(lons, dtype=object), errors="coerce").to_numpy(dtype=float)
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    index = get_spatial_index()
+
+    dong = np.full(len(lat), None, dtype=object)
+    method = np.full(len(lat), None, dtype=object)
+    centroid_km = np.full(len(lat), np.nan)
+    assigned = np.zeros(len(lat), dtype=bool)
+
+    min_lat, max_lat, min_lon, max_lon = CITY_BBOX
+    inside_city = valid & (lat >= min_lat - CITY_BBOX_MARGIN_DEG) & (lat <= max_lat + CITY_BBOX_MARGIN_DEG) \
+        & (lon >= min_lon - CITY_BBOX_MARGIN_DEG) & (lon <= max_lon + CITY_BBOX_MARGIN_DEG)
+    method[valid & ~inside_city] = "충주시 밖"
+
+    # 1) 행정동 경계 포함 판정 (bbox로 후보 좌표를 먼저 좁힘)
+    for name, edges, (min_x, min_y, max_x, max_y) in index["polygons"]:
+        candidates = np.flatnonzero(~assigned & valid & (lon >= min_x) & (lon <= max_x) & (lat >= min_y) & (lat <= max_y))
+        if len(candidates):
+            hit = candidates[_points_in_polygon(lon[candidates], lat[candidates], edges)]
+            dong[hit] = name
+            method[hit] = "경계"
+            assigned[hit] = True
+
+    # 2) 충주시 범위 안의 나머지는 최근접 행정동 중심 (NEAREST_DONG_MAX_KM 이내만)
+    rest = np.flatnonzero(inside_city & ~assigned)
+    if len(rest):
+        distance, nearest = index["tree"].query(_project_km(lat[rest], lon[rest]), k=1)
+        near = distance[:, 0] <= NEAREST_DONG_MAX_KM
+        dong[rest[near]] = index["names"][nearest[near, 0]]
+        method[rest[near]] = "최근접 중심"
+        method[rest[~near]] = "중심 거리 초과"
+        assigned[rest[near]] = True
+
+    # 중심거리는 판정된 행정동의 중심 기준
+    position = {name: i for i, name in enumerate(index["names"])}
+    with_centroid = np.flatnonzero(assigned & pd.Series(dong, dtype=object).isin(position).to_numpy())
+    if len(with_centroid):
+        centroids = index["centroids"][[position[name] for name in dong[with_centroid]]]
+        centroid_km[with_centroid] = haversine_km(lat[with_centroid], lon[with_centroid], centroids[:, 0], centroids[:, 1])
+
+    return pd.DataFrame({
+        "행정동": dong,
+        "판정방식": method,
+        "중심거리(km)": np.round(centroid_km, 3),
+        "시청거리(km)": np.round(haversine_km(lat, lon, *CITY_HALL), 3),
+    })
+
+# ─────────────────────────────────────────────
+# ✅ 일괄 변환 체크포인트: 업로드 파일 해시별 {"results": {행 번호: 결과}, "submitted": {행 번호: Future}}
+#    서버 프로세스 메모리에 보관 → 재실행(지도 보기 등 위젯 조작)·브라우저 재접속 시 이어서 변환
+#    submitted는 호출을 넘긴 행 → 재실행 시 아직 진행 중인 행은 다시 호출하지 않고 그 결과를 기다림 (쿼터 중복 소모 방지)
+# ─────────────────────────────────────────────
+CHECKPOINT_STORE_SIZE = 8
+
+_checkpoints = BoundedLRU(CHECKPOINT_STORE_SIZE)
+
+def uploaded_digest(uploaded):
+    return hashlib.sha1(uploaded.getvalue()).hexdigest()
+
+def get_checkpoint(kind, digest):
+    return _checkpoints.get_or_create((kind, digest), lambda: {"results": {}, "submitted": {}})
+
+# ─────────────────────────────────────────────
+# ✅ 일괄 변환 엔진: 스레드 풀(동시 호출 수 제한) + 진행률 표시
+#    fn은 UI를 건드리지 않는 함수여야 함 (진행률은 메인 스레드에서 갱신)
+#    결과는 행이 끝나는 즉시 checkpoint에 기록 → 스크립트가 중간에 재실행돼도 끝난 행은 유지
+#    API 오류 결과는 이번 실행에만 쓰고 체크포인트에는 남기지 않음 (재실행 시 다시 조회)
+# ─────────────────────────────────────────────
+def run_batch(items, fn, label="변환 중", workers=BATCH_WORKERS, checkpoint=None):
+    checkpoint = {"results": {}, "submitted": {}} if checkpoint is None else checkpoint
+    results, submitted = checkpoint["results"], checkpoint["submitted"]
+    total = len(items)
+    pending = [i for i in range(total) if i not in results]
+    if pending:
+        if len(pending) < total:
+            st.caption(f"♻️ 이전 변환 결과 {total - len(pending):,}건을 이어서 사용합니다.")
+
+        def work(i):
+            result = fn(*items[i])
+            if not is_api_failure(result):
+                results[i] = result
+            return result
+
+        # 세션 공유 연결 풀 크기를 넘지 않도록 동시 일괄 변환 수를 제한 (초과분은 앞선 변환이 끝날 때까지 대기)
+        if not _batch_slots.acquire(blocking=False):
+            with st.spinner("⏳ 다른 일괄 변환이 끝나기를 기다리는 중..."):
+                _batch_slots.acquire()
+        failed = {}
+        try:
+            bar = st.progress(0.0, text=f"{label}... {total - len(pending):,}/{total:,}")
+            pool = ThreadPoolExecutor(max_workers=min(workers, BATCH_WORKERS))
+            try:
+                # 이전 실행에서 넘긴 호출이 아직 진행 중이면 그대로 이어받고, 취소·실패로 끝난 행만 새로 호출
+                futures = {}
+                for i in pending:
+                    future = submitted.get(i)
+                    if future is None or future.done():
+                        future = submitted[i] = pool.submit(work, i)
+                    futures[future] = i
+                for future in as_completed(futures):
+                    i = futures[future]
+                    result = future.result()
+                    submitted.pop(i, None)
+                    if is_api_failure(result):
+                        failed[i] = result
+                    done = len(results) + len(failed)
+                    bar.progress(done / total, text=f"{label}... {done:,}/{total:,}")
+            finally:
+                # 재실행으로 중단되면 대기 중인 행은 취소 (진행 중인 행은 끝나는 대로 체크포인트에 기록)
+                pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            _batch_slots.release()
+        bar.empty()
+        if failed:
+            st.warning(f"⚠️ API 오류 {len(failed):,}건은 저장하지 않았습니다. 다시 실행하면 해당 건만 재조회합니다.")
+        return [results[i] if i in results else failed[i] for i in range(total)]
+    return [results[i] for i in range(total)]
+
 # ─────────────────────────────────────────────
 # ✅ 파일 업로드용 주소 → 좌표 (핵심부만)
 # ─────────────────────────────────────────────
@@ -268,9 +641,17 @@ def handle_file_address_to_coords():
             st.error("❌ '주소' 컬럼이 누락되었습니다.")
             return
 
+        # 정규화 키가 같은 행은 한 번만 변환 후 결과를 나눠 씀
+        addresses = df["주소"].tolist()
+        unique_keys, codes = group_addresses(addresses)
+        st.caption(f"🔎 고유 주소 {len(unique_keys):,}건 변환 (전체 {len(addresses):,}행, 중복·표기 차이 {len(addresses) - len(unique_keys):,}건 통합)")
+        checkpoint = get_checkpoint("forward", uploaded_digest(uploaded))
+        unique_results = run_batch([(key,) for key in unique_keys], resolve_address, "주소 → 좌표 변환 중", checkpoint=checkpoint)
         results = []
-        for addr in df["주소"]:
-            r = get_coords_with_fallback(addr)
+        for addr, code in zip(addresses, codes):
+            r = unique_results[code]
+            if not r["위도"] and unique_keys[code]:
+                r = representative_coords(addr, r)   # 대표좌표 보정은 행마다 원문 주소 기준
             results.append({
                 "주소": addr,
                 "위도": r["위도"],
@@ -314,18 +695,26 @@ def handle_file_coords_to_address():
             st.error("❌ '위도', '경도' 컬럼이 누락되었습니다.")
             return
 
-        results = []
-        for _, row in df.iterrows():
-            r = get_address_from_kakao(row["위도"], row["경도"])
-            results.append({
-                "위도": row["위도"],
-                "경도": row["경도"],
-                "지번주소": r.get("지번주소", ""),
-                "도로명주소": r.get("도로명주소", ""),
-                "오류": r["오류"]
-            })
+        # 행정동·시청 거리는 로컬 공간 색인으로 한 번에 계산 (API 호출 없음)
+        local_only = st.checkbox("🧭 API 없이 행정동·시청 거리만 계산", key="coords_local_only")
+        local_df = assign_dongs(df["위도"], df["경도"])
+        if local_only:
+            result_df = pd.concat([df[["위도", "경도"]].reset_index(drop=True), local_df], axis=1)
+        else:
+            coords = list(zip(df["위도"], df["경도"]))
+            checkpoint = get_checkpoint("reverse", uploaded_digest(uploaded))
+            converted = run_batch(coords, get_address_from_kakao, "좌표 → 주소 변환 중", checkpoint=checkpoint)
+            results = []
+            for (lat, lon), r in zip(coords, converted):
+                results.append({
+                    "위도": lat,
+                    "경도": lon,
+                    "지번주소": r.get("지번주소", ""),
+                    "도로명주소": r.get("도로명주소", ""),
+                    "오류": r["오류"]
+                })
+            result_df = pd.concat([pd.DataFrame(results), local_df], axis=1)
 
-        result_df = pd.DataFrame(results)
         st.success("✅ 변환 완료")
         st.dataframe(result_df)
         to_excel_download(result_df, "결과_좌표→주소.xlsx")
@@ -350,8 +739,21 @@ def to_excel_download(df, filename):
     df.to_excel(buffer, index=False)
     st.download_button("📤 결과 다운로드", data=buffer.getvalue(), file_name=filename, mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
+# ✅ 캐시 적중률 (서버 기동 후 전체 세션 누적)
+def render_cache_stats():
+    stats = geocode_cache.cache_stats()
+    counts = geocode_cache.entry_counts()
+    cols = st.columns(2)
+    for col, kind, label in zip(cols, ["forward", "reverse"], ["주소 → 좌표", "좌표 → 주소"]):
+        s = stats[kind]
+        rate = f"{s['rate']:.0%}" if s["rate"] is not None else "-"
+        col.metric(f"💾 캐시 적중률 ({label})", rate, help=f"적중 {s['hit']:,} / 미적중 {s['miss']:,}, 저장 {counts[kind]:,}건")
+
 def run_geocoding_tool():
     st.title("📍 주소-좌표 변환기")
+    render_cache_stats()
+    if address_index.index_size():
+        st.caption(f"📚 로컬 주소 색인 {address_index.index_size():,}건 사용 중 (색인에 없는 주소만 카카오 API 조회)")
 
     col1, col2 = st.columns(2)
     with col1:
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# address_index.py
+# ✅ 충주시 로컬 주소 색인 (오프라인 주소 → 좌표, 인근번지 보정)
+#    - 원천: 도로명주소 위치정보(도로명주소·지번주소·좌표) 내려받기 파일 → build 명령으로 색인 CSV 생성
+#    - 정렬된 주소 키 목록 + 이진 탐색 → 정확 일치 / 접두어 검색
+#    - 지역(시군구+도로명 또는 법정동)별 (산, 본번, 부번) 정렬 목록 → 같은 본번의 가장 가까운 부번
+#    - 색인 파일이 없으면 비활성 (카카오 API만 사용)
+#
+#    python address_index.py build 위치정보.csv                    # 위도/경도 컬럼
+#    python address_index.py build 위치정보.txt --sep "|" --x-col X좌표 --y-col Y좌표 --crs 5179   # UTM-K 좌표 (pyproj 필요)
+#    python address_index.py lookup "충주시 으뜸로 21"
+#    python address_index.py prefix "충주시 으뜸로"
+
+import os
+import re
+import sys
+import bisect
+import argparse
+import threading
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(BASE_DIR, "data", "reference", "chungju_address_index.csv")
+REGION_FILTER = "충주시"
+SIDO_SUFFIXES = ("도", "특별시", "광역시", "특별자치시")
+
+LOT_RE = re.compile(r"^(.*?) (산)?(\d+)(?:-(\d+))?$")
+MOUNTAIN_RE = re.compile(r"(\s)산\s*(?=\d)")
+
+_lock = threading.Lock()
+_index = {"mtime": None, "keys": [], "coords": [], "lots": {}}
+
+# ✅ 색인 키: 공백 정리, 앞의 시도 제거 (충청북도 충주시 … → 충주시 …), "산 12" → "산12"
+def index_key(address):
+    tokens = str(address or "").split()
+    if len(tokens) > 2 and tokens[0].endswith(SIDO_SUFFIXES):
+        tokens = tokens[1:]
+    return MOUNTAIN_RE.sub(r"\1산", " ".join(tokens))
+
+# ✅ "충주시 교현동 123-4" → ("충주시 교현동", 산 여부, 123, 4)
+def split_lot(key):
+    match = LOT_RE.match(key)
+    if not match:
+        return None
+    area, mountain, main, sub = match.groups()
+    return area, bool(mountain), int(main), int(sub or 0)
+
+def _lot_text(mountain, main, sub):
+    return f"{'산' if mountain else ''}{main}" + (f"-{sub}" if sub else "")
+
+# ─────────────────────────────────────────────
+# ✅ 색인 생성
+# ─────────────────────────────────────────────
+def _read_source(path, sep, encoding):
+    for enc in ([encoding] if encoding else ["utf-8-sig", "cp949"]):
+        try:
+            return pd.read_csv(path, sep=sep, dtype=str, encoding=enc).fillna("")
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"원천 파일 인코딩을 확인할 수 없습니다: {path}")
+
+def _to_wgs84(x, y, crs):
+    try:
+        from pyproj import Transformer
+    except ImportError as e:
+        raise ImportError(f"좌표계 변환(EPSG:{crs} → WGS84)에는 pyproj가 필요합니다: {e}")
+    lon, lat = Transformer.from_crs(f"EPSG:{crs}", "EPSG:4326", always_xy=True).transform(
+        pd.to_numeric(x, errors="coerce").to_numpy(), pd.to_numeric(y, errors="coerce").to_numpy()
+    )
+    return pd.Series(lat, index=x.index), pd.Series(lon, index=x.index)
+
+def build_index(source, out=INDEX_PATH, sep=",", encoding=None, road_col="도로명주소", jibun_col="지번주소",
+                lat_col="위도", lon_col="경도", x_col=None, y_col=None, crs=None, region=REGION_FILTER):
+    df = _read_source(source, sep, encoding)
+    if x_col and y_col:
+        lat, lon = _to_wgs84(df[x_col], df[y_col], crs or 5179)
+    else:
+        lat, lon = pd.to_numeric(df[lat_col], errors="coerce"), pd.to_numeric(df[lon_col], errors="coerce")
+
+    # 도로명주소·지번주소를 각각 키로 등록 (같은 키가 여러 번 나오면 첫 좌표 사용)
+    frames = []
+    for col in (road_col, jibun_col):
+        if col in df.columns:
+            frames.append(pd.DataFrame({"주소": df[col].map(index_key), "위도": lat, "경도": lon}))
+    if not frames:
+        raise ValueError(f"주소 컬럼이 없습니다: {road_col}, {jibun_col}")
+    index = pd.concat(frames, ignore_index=True).dropna()
+    index = index[(index["주소"] != "") & index["주소"].str.contains(region, regex=False)]
+    index = index.drop_duplicates("주소").sort_values("주소")
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    index.to_csv(out, index=False, encoding="utf-8", float_format="%.7f")
+    return len(index)
+
+# ─────────────────────────────────────────────
+# ✅ 색인 적재 (파일 수정 시각이 바뀌면 다시 읽음)
+# ─────────────────────────────────────────────
+def get_index(path=None):
+    path = path or INDEX_PATH
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _lock:
+        if _index["mtime"] == mtime:
+            return _index
+        keys, coords, lots = [], [], {}
+        if mtime is not None:
+            df = pd.read_csv(path, dtype={"주소": str}, encoding="utf-8").sort_values("주소")
+            keys = df["주소"].tolist()
+            coords = list(zip(df["위도"].map("{:.7f}".format), df["경도"].map("{:.7f}".format)))
+            for key, coord in zip(keys, coords):
+                lot = split_lot(key)
+                if lot:
+                    lots.setdefault(lot[0], []).append((lot[1], lot[2], lot[3], coord))
+            for entries in lots.values():
+                entries.sort()
+        _index.update(mtime=mtime, keys=keys, coords=coords, lots=lots)
+        return _index
+
+def index_size(path=None):
+    return len(get_index(path)["keys"])
+
+# ✅ 정확 일치 → {"위도", "경도", "정확도"} 또는 None
+def lookup_exact(address, path=None):
+    index = get_index(path)
+    key = index_key(address)
+    i = bisect.bisect_left(index["keys"], key)
+    if i < len(index["keys"]) and index["keys"][i] == key:
+        lat, lon = index["coords"][i]
+        return {"위도": lat, "경도": lon, "정확도": "정좌표", "오류": ""}
+    return None
+
+# ✅ 같은 지역·본번 안에서 부번이 가장 가까운 번지 (같은 거리면 작은 부번)
+def lookup_nearest(address, path=None):
+    lot = split_lot(index_key(address))
+    if not lot:
+        return None
+    area, mountain, main, sub = lot
+    entries = get_index(path)["lots"].get(area, [])
+    lo = bisect.bisect_left(entries, (mountain, main, -1))
+    hi = bisect.bisect_left(entries, (mountain, main + 1, -1))
+    if lo == hi:
+        return None
+    _, _, near_sub, (lat, lon) = min(entries[lo:hi], key=lambda e: (abs(e[2] - sub), e[2]))
+    return {"위도": lat, "경도": lon, "정확도": f"인근번지 보정({_lot_text(mountain, main, near_sub)})", "오류": ""}
+
+# ✅ 접두어 검색 → 최대 limit개 주소 키 (자동완성/주소 확인용)
+def search_prefix(prefix, limit=20, path=None):
+    keys = get_index(path)["keys"]
+    prefix = index_key(prefix)
+    start = bisect.bisect_left(keys, prefix)
+    found = []
+    for key in keys[start:start + limit]:
+        if not key.startswith(prefix):
+            break
+        found.append(key)
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="충주시 로컬 주소 색인")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="도로명주소 위치정보 파일로 색인 생성")
+    build.add_argument("source")
+    build.add_argument("--out", default=INDEX_PATH)
+    build.add_argument("--sep", default=",")
+    build.add_argument("--encoding", default=None)
+    build.add_argument("--road-col", default="도로명주소")
+    build.add_argument("--jibun-col", default="지번주소")
+    build.add_argument("--lat-col", default="위도")
+    build.add_argument("--lon-col", default="경도")
+    build.add_argument("--x-col", help="투영 좌표 X 컬럼 (지정 시 --crs로 변환)")
+    build.add_argument("--y-col", help="투영 좌표 Y 컬럼")
+    build.add_argument("--crs", type=int, default=5179, help="투영 좌표계 EPSG 코드 (기본: UTM-K)")
+    build.add_argument("--region", default=REGION_FILTER, help="색인에 남길 지역명")
+    lookup = sub.add_parser("lookup", help="주소 1건 조회 (정확 일치 → 인근번지)")
+    lookup.add_argument("address")
+    prefix = sub.add_parser("prefix", help="접두어 검색")
+    prefix.add_argument("prefix")
+    prefix.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = build_index(args.source, args.out, args.sep, args.encoding, args.road_col, args.jibun_col,
+                            args.lat_col, args.lon_col, args.x_col, args.y_col, args.crs, args.region)
+        print(f"✅ 주소 키 {count:,}건 → {args.out}")
+    elif args.command == "lookup":
+        print(lookup_exact(args.address) or lookup_nearest(args.address) or "❌ 색인에 없음")
+    else:
+        for key in search_prefix(args.prefix, args.limit):
+            print(key)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
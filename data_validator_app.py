@@ -6,15 +6,34 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import re
 from io import BytesIO
 import chardet
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
+import xlsxwriter
 import os
 import locale
+import hashlib
+import codecs
+import threading
+import time
+import sys
+import random
+import shutil
+import tempfile
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque
 from openai import OpenAI
+from regex_cache import get_cached_regex, put_cached_regex, description_hash
+from regex_inference import apply_inferred_regexes
+from memory_cache import BoundedLRU
+
+try:
+    from re import _parser as sre_parser      # Python 3.11+
+except ImportError:
+    import sre_parse as sre_parser
 
 # ✅ 한글 가나다 정렬을 위한 로케일 설정
 locale.setlocale(locale.LC_ALL, '')
@@ -23,18 +42,131 @@ locale.setlocale(locale.LC_ALL, '')
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 META_DIR = os.path.join(BASE_DIR, "meta_dicts_final_clean")
 
-# ✅ 메타 사전 로딩 (키 공백 제거)
-def load_meta_dict(standard):
-    path = os.path.join(META_DIR, f"{standard}.json")
-    if not os.path.exists(path):
-        return None
+# ─────────────────────────────────────────────
+# ✅ 메타 표준 카탈로그 (전체 JSON을 프로세스 메모리에 1회 로딩·컴파일)
+#    파일 mtime이 바뀐 표준만 다시 읽고, 추가/삭제된 파일도 반영
+#    로딩 시 설명 전용 컬럼은 표현형식 예시로 정규식을 로컬 추론 → GPT는 추론 못 한 컬럼만 호출
+# ─────────────────────────────────────────────
+_catalog = {"signature": None, "version": None, "standards": {}, "names": [], "column_index": {}}
+_catalog_lock = threading.Lock()
+
+def _read_meta_file(path):
     with open(path, encoding="utf-8") as f:
         original_meta = json.load(f)
-    return {k.strip().replace(" ", ""): v for k, v in original_meta.items()}
+    meta = {k.strip().replace(" ", ""): v for k, v in original_meta.items()}
+    apply_inferred_regexes(meta)
+    return meta
+
+def _scan_meta_dir():
+    if not os.path.exists(META_DIR):
+        return {}
+    return {
+        entry.name[:-len(".json")]: (entry.path, entry.stat().st_mtime_ns)
+        for entry in os.scandir(META_DIR)
+        if entry.name.endswith(".json")
+    }
+
+# 새 카탈로그는 지역 변수로 다 만든 뒤 잠금 안에서 한 번에 교체 → 다른 세션은 이전 또는 새 카탈로그 전체만 봄
+def get_meta_catalog():
+    global _catalog
+    files = _scan_meta_dir()
+    signature = tuple(sorted((name, mtime) for name, (_, mtime) in files.items()))
+    catalog = _catalog
+    if signature == catalog["signature"]:
+        return catalog
+
+    with _catalog_lock:
+        catalog = _catalog
+        if signature == catalog["signature"]:
+            return catalog
+        standards = {}
+        for name, (path, mtime) in files.items():
+            entry = catalog["standards"].get(name)
+            if entry is None or entry["mtime"] != mtime:
+                meta = _read_meta_file(path)
+                entry = {"mtime": mtime, "meta": meta, "rules": compile_meta_rules(meta)}
+            standards[name] = entry
+        catalog = {
+            "signature": signature,
+            "version": hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:12],
+            "standards": standards,
+            "names": sorted(standards, key=locale.strxfrm),
+            "column_index": build_column_index(standards),
+        }
+        _catalog = catalog
+    return catalog
+
+def list_standards():
+    return get_meta_catalog()["names"]
+
+# ✅ 컬럼명 → 해당 컬럼을 쓰는 표준 목록 (역색인)
+def build_column_index(standards):
+    index = {}
+    for name, entry in standards.items():
+        for col in entry["rules"]:
+            index.setdefault(col, set()).add(name)
+    return {col: frozenset(names) for col, names in index.items()}
+
+SUGGEST_MIN_SCORE = 0.5      # 추천 1순위를 자동 선택·채택하는 최소 점수 (UI·CLI 공통)
+
+# ✅ 업로드 헤더로 표준 자동 추천 (역색인 1회 조회로 전체 표준 점수화)
+#    점수: 일치 컬럼 수 / (헤더 컬럼 수 + 표준 컬럼 수 - 일치 컬럼 수)
+def suggest_standards(columns, top_n=5):
+    catalog = get_meta_catalog()
+    header = {str(col).strip().replace(" ", "") for col in columns}
+    if not header:
+        return []
+
+    hits = {}
+    for col in header:
+        for name in catalog["column_index"].get(col, ()):
+            hits[name] = hits.get(name, 0) + 1
+
+    results = []
+    for name, matched in hits.items():
+        standard_size = len(catalog["standards"][name]["rules"])
+        results.append({
+            "표준": name,
+            "일치컬럼수": matched,
+            "업로드일치율(%)": round(matched / len(header) * 100, 1),
+            "표준일치율(%)": round(matched / standard_size * 100, 1),
+            "점수": matched / (len(header) + standard_size - matched),
+        })
+    results.sort(key=lambda r: (-r["점수"], -r["일치컬럼수"], r["표준"]))
+    return results[:top_n]
+
+# ✅ 메타 사전 로딩 (키 공백 제거) — 카탈로그 사본 반환 (GPT 정규식 채움 등 세션별 변경이 공유되지 않도록)
+def load_meta_dict(standard):
+    entry = get_meta_catalog()["standards"].get(standard)
+    if entry is None:
+        return None
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in entry["meta"].items()}
+
+# ✅ 사전 컴파일된 컬럼 규칙 (GPT로 정규식이 채워진 컬럼만 meta 기준으로 다시 컴파일)
+def get_standard_rules(standard, meta=None):
+    entry = get_meta_catalog()["standards"].get(standard)
+    if entry is None:
+        return compile_meta_rules(meta or {})
+    rules = {}
+    for col, rule in entry["rules"].items():
+        meta_col = (meta or {}).get(col)
+        if isinstance(meta_col, dict) and meta_col.get("정규식출처") == GPT_SOURCE:
+            rules[col] = compile_column_rule(meta_col, col)
+        else:
+            rules[col] = dict(rule)
+    return rules
 
 # ✅ GPT 기반 정규식 생성 함수 (OpenAI SDK v1.x 방식)
 def generate_regex_from_description(description,expression, column_name):
-    client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+    try:
+        return request_regex_from_gpt(description, expression, column_name)
+    except Exception as e:
+        st.warning(f"❗ 정규식 생성 실패: {e}")
+        return None
+
+# ✅ GPT 호출 본체 (실패 시 예외 발생, 스레드에서 호출 가능하도록 UI 출력 없음)
+def request_regex_from_gpt(description, expression, column_name, client=None):
+    client = client or OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
 
     prompt = f"""
 당신은 공공데이터 형식 검사를 위한 정규식을 생성하는 전문가입니다.
@@ -56,18 +188,120 @@ def generate_regex_from_description(description,expression, column_name):
 ⚠️ 반드시 정규식만 한 줄로 출력해주세요. 따옴표나 설명 없이, 정규식만 주세요.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        st.warning(f"❗ 정규식 생성 실패: {e}")
-        return None
+    response = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2,
+    )
+    return response.choices[0].message.content.strip()
+
+# ✅ 설명 기반 정규식: 디스크 캐시 → GPT 순서로 조회 (생성 성공 시 캐시에 저장)
+def get_generated_regex(standard, col, meta_col):
+    description = meta_col.get("설명")
+    expression = meta_col.get("표현형식")
+    regex = get_cached_regex(standard, col, description, expression)
+    if regex is None:
+        regex = generate_regex_from_description(description, expression, col)
+        if regex:
+            put_cached_regex(standard, col, description, expression, regex)
+    return regex
+
+# ─────────────────────────────────────────────
+# ✅ 표준 선택 시 GPT 정규식 일괄 사전 생성 (검증 단계에서는 네트워크 호출 없음)
+# ─────────────────────────────────────────────
+GPT_SOURCE = "GPT"
+REGEX_PREFETCH_WORKERS = 4
+REGEX_FAILURE_RETRY_SEC = 600     # 생성 실패한 컬럼은 이 시간 동안 재호출하지 않음
+
+# ✅ 생성 실패 기록 (프로세스 전체 공유): (표준, 컬럼, 설명 해시) → (실패 시각, 오류)
+#    재실행마다 새로 읽는 메타 사본에는 실패 표시가 남지 않으므로 여기서 기억
+_regex_failures = {}
+_regex_failure_lock = threading.Lock()
 
-def validate_cell(val, col, meta, row_data):
+def _regex_failure_key(standard, col, meta_col):
+    return (standard or "", col, description_hash(meta_col.get("설명"), meta_col.get("표현형식")))
+
+def recent_regex_failure(standard, col, meta_col):
+    with _regex_failure_lock:
+        entry = _regex_failures.get(_regex_failure_key(standard, col, meta_col))
+    if entry and time.time() - entry[0] < REGEX_FAILURE_RETRY_SEC:
+        return entry
+    return None
+
+def _record_regex_failure(standard, col, meta_col, error):
+    with _regex_failure_lock:
+        if error is False:
+            _regex_failures.pop(_regex_failure_key(standard, col, meta_col), None)
+        else:
+            _regex_failures[_regex_failure_key(standard, col, meta_col)] = (time.time(), error)
+
+def find_description_only_columns(meta, columns=None):
+    targets = []
+    for col, meta_col in meta.items():
+        if columns is not None and col not in columns:
+            continue
+        if not isinstance(meta_col, dict) or meta_col.get("정규식출처") == GPT_SOURCE:
+            continue
+        if not meta_col.get("정규식") and not meta_col.get("허용값") and meta_col.get("설명"):
+            targets.append(col)
+    return targets
+
+# ✅ 정규식/허용값 없는 컬럼을 찾아 캐시 조회 후, 미스만 스레드 풀로 동시 생성
+#    결과는 meta_col["정규식"]에 채우고 출처를 GPT로 표시 (생성 실패도 표시하여 재호출 방지)
+#    최근 실패한 컬럼은 REGEX_FAILURE_RETRY_SEC 동안 재호출 없이 실패로 돌려줌 (위젯 조작마다 재시도 방지)
+#    generate=False 이면 캐시만 사용하고 캐시에 없는 컬럼은 "미생성"으로 돌려줌 (오프라인 실행용)
+def prefetch_generated_regexes(standard, meta, columns=None, max_workers=REGEX_PREFETCH_WORKERS, generate=True):
+    targets = find_description_only_columns(meta, columns)
+    failures = {}
+    missing = []
+    for col in targets:
+        meta_col = meta[col]
+        regex = get_cached_regex(standard, col, meta_col.get("설명"), meta_col.get("표현형식"))
+        if regex is None:
+            missing.append(col)
+        else:
+            meta_col["정규식"] = regex
+            meta_col["정규식출처"] = GPT_SOURCE
+
+    if not generate:
+        return {"대상": len(targets), "생성": 0, "실패": failures, "미생성": missing}
+
+    retry = []
+    for col in missing:
+        failure = recent_regex_failure(standard, col, meta[col])
+        if failure is None:
+            retry.append(col)
+            continue
+        if failure[1] is not None:
+            failures[col] = failure[1]
+        meta[col]["정규식출처"] = GPT_SOURCE
+
+    if retry:
+        def generate_one(col):
+            meta_col = meta[col]
+            description = meta_col.get("설명")
+            expression = meta_col.get("표현형식")
+            try:
+                regex = request_regex_from_gpt(description, expression, col)
+            except Exception as e:
+                return col, None, e
+            if regex:
+                put_cached_regex(standard, col, description, expression, regex)
+            return col, regex, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for col, regex, error in pool.map(generate_one, retry):
+                if regex:
+                    meta[col]["정규식"] = regex
+                if error is not None:
+                    failures[col] = error
+                _record_regex_failure(standard, col, meta[col], False if regex else error)
+                meta[col]["정규식출처"] = GPT_SOURCE
+
+    generated = sum(1 for col in retry if meta[col].get("정규식"))
+    return {"대상": len(targets), "생성": generated, "실패": failures, "미생성": []}
+
+def validate_cell(val, col, meta, row_data, standard=None):
     #st.write(f"🔥 DEBUG - meta_col 존재 여부: {meta_col}")
     errors = []
     val_raw = str(val).strip()
@@ -94,7 +328,6 @@ def validate_cell(val, col, meta, row_data):
     regex = meta_col.get("정규식")
     allowed = meta_col.get("허용값")
     description = meta_col.get("설명")
-    expression = meta_col.get("표현형식")
 
     if regex:
         try:
@@ -107,7 +340,7 @@ def validate_cell(val, col, meta, row_data):
         if val_clean not in allowed_clean:
             errors.append("허용값 오류")
     elif description:
-        regex = generate_regex_from_description(description, expression, col)
+        regex = get_generated_regex(standard, col, meta_col)
         if regex:
             meta_col["정규식"] = regex  # 캐싱
         try:
@@ -119,33 +352,1612 @@ def validate_cell(val, col, meta, row_data):
     return errors
 
 
+# ─────────────────────────────────────────────
+# ✅ 컬럼 단위 벡터화 검증 엔진
+# ─────────────────────────────────────────────
+EMPTY_TOKENS = ("", "NAN", "NA")
+ERROR_COLUMNS = ["행", "컬럼", "오류"]
+
+# ─────────────────────────────────────────────
+# ✅ 정규식 안전 실행 (ReDoS 방지)
+#    - 컴파일 시 표현형식 기반 공격 입력으로 길이를 늘려가며 매칭 시간을 측정
+#    - 길이 대비 초선형 증가/시간 초과 패턴은 소유 수량자로 재작성, 그래도 위험하면 거부(형식 검사 생략)
+#      소유 수량자는 허용 문자열을 줄일 수만 있으므로, 원래 패턴 구조에서 생성한 일치 표본을 재작성 패턴도
+#      모두 같게 판정해야 채택 (하나라도 다르면 오탐 방지를 위해 거부)
+#      재작성할 수 없어도 증가가 다항식이라 최장 측정 길이까지 시간 초과가 없으면 원래 패턴을 "예산" 상태로 사용
+#    - 공격 입력 꼬리는 패턴에서 만듦: 어떤 문자 클래스도 받지 않는 문자, 리터럴 구분자 2회 반복
+#    - 재작성·예산(프로파일링에서 위험 판정된) 패턴만 배치 단위로 매칭하며 컬럼별 시간 예산 초과 시 나머지 셀은 검사 생략
+#      안전 판정 패턴은 예산 없이 전체 셀을 검사 (전국 단위 대용량 파일에서도 형식 검사 누락 없음)
+#      예산은 검증 1회(전체 청크·파티션) 동안 규칙 dict의 spent/skipped로 누적 (청크마다 초기화하지 않음)
+#    파이썬 re는 매칭 도중 중단할 수 없으므로 예산은 배치 사이에서 확인함 (위험 패턴은 사전 프로파일링으로 차단)
+# ─────────────────────────────────────────────
+PROFILE_LENGTHS = (8, 12, 16, 20, 24, 32, 48, 64, 128, 256, 512, 1024, 2048)
+PROFILE_SLOW_SEC = 0.05       # 한 번의 매칭이 이보다 오래 걸리면 위험
+PROFILE_MIN_SEC = 0.001       # 이보다 짧은 측정값은 증가율 판단에서 제외 (측정 잡음)
+PROFILE_GROWTH_POWER = 1.5    # 길이 비율 ** 1.5 보다 빠르게 늘면 초선형으로 판단
+MATCH_BATCH_ROWS = 20_000
+COLUMN_MATCH_BUDGET_SEC = 5.0
+ADVERSARIAL_BREAKER = "\x00"
+BREAKER_CANDIDATES = "\n\x00!~#@§"  # 패턴의 어떤 문자 클래스도 받지 않는 첫 문자를 끝에 붙임 (. 은 \n 불허)
+PROFILE_MAX_SEPARATORS = 4         # 끝에 두 번 반복해 붙일 구분자(영숫자 아닌 리터럴) 수
+PROFILE_POSITIVE_SAMPLES = 200     # 재작성 동등성 확인용 일치 표본 수
+PROFILE_SAMPLE_MAX_REPEAT = 4      # 표본 생성 시 수량자 반복 상한 (최소 반복 + 4)
+SAMPLE_ALPHABET = "aZ09 -.,/:_가힣"
+
+_pattern_profiles = {}    # (정규식, 표현형식) → 프로파일 결과
+_slow_rules = {}          # (표준, 컬럼) → 실행 시간 예산 초과 기록
+_profile_lock = threading.Lock()
+
+# ✅ 패턴 구조에서 매칭을 끝에서 실패시키는 꼬리 문자열 생성
+#    - 어떤 문자 클래스도 받지 않는 문자 1개 ([^,] · . 처럼 거의 모든 문자를 받는 클래스가 있으면 고정 문자로는 실패하지 않음)
+#    - 패턴 리터럴 구분자 2회 반복 ("a"*24 + ",," 는 ([^,]+,?)+ 를 지수 시간 역추적시킴)
+def adversarial_breakers(pattern):
+    try:
+        parsed = sre_parser.parse(pattern.pattern, pattern.flags)
+    except re.error:
+        return [ADVERSARIAL_BREAKER]
+    atoms = []
+    _collect_atoms(parsed, atoms)
+    dotall = bool(pattern.flags & re.DOTALL)
+    rejected = next(
+        (ch for ch in BREAKER_CANDIDATES if not any(_atom_accepts(ch, name, av, dotall) for name, av in atoms)),
+        ADVERSARIAL_BREAKER,
+    )
+    separators = dict.fromkeys(chr(av) for name, av in atoms if name == "LITERAL" and not chr(av).isalnum())
+    return [rejected] + [sep * 2 for sep in list(separators)[:PROFILE_MAX_SEPARATORS]]
+
+def _collect_atoms(items, atoms):
+    for op, av in items:
+        name = str(op)
+        if name in ("LITERAL", "NOT_LITERAL", "ANY", "IN"):
+            atoms.append((name, av))
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            _collect_atoms(av[2], atoms)
+        elif name in ("SUBPATTERN", "ASSERT", "ASSERT_NOT"):
+            _collect_atoms(av[-1], atoms)
+        elif name == "ATOMIC_GROUP":
+            _collect_atoms(av, atoms)
+        elif name == "BRANCH":
+            for branch in av[1]:
+                _collect_atoms(branch, atoms)
+        elif name == "GROUPREF_EXISTS":
+            for branch in av[1:]:
+                if branch:
+                    _collect_atoms(branch, atoms)
+
+def _atom_accepts(ch, name, av, dotall):
+    if name == "LITERAL":
+        return ch == chr(av)
+    if name == "NOT_LITERAL":
+        return ch != chr(av)
+    if name == "ANY":
+        return dotall or ch != "\n"
+    try:
+        return _in_class(ch, av)
+    except ValueError:
+        return True     # 판정할 수 없는 범주는 받는 것으로 간주
+
+def adversarial_inputs(expression, length, breakers=(ADVERSARIAL_BREAKER,)):
+    base = str(expression or "").strip() or "a1가"
+    repeated = (base * (length // len(base) + 1))[:length]
+    inputs = []
+    for breaker in breakers:
+        inputs.append(repeated + breaker)
+        for ch in dict.fromkeys(base + "a1가 -."):
+            inputs.append(ch * length + breaker)
+    return inputs
+
+def _time_fullmatch(pattern, inputs):
+    worst = 0.0
+    for text in inputs:
+        start = time.perf_counter()
+        pattern.fullmatch(text)
+        worst = max(worst, time.perf_counter() - start)
+        if worst > PROFILE_SLOW_SEC:
+            break               # 이미 위험 판정 → 나머지 입력은 측정 생략
+    return worst
+
+# ✅ 길이를 늘려가며 최악 매칭 시간 측정 → {"safe", "length", "elapsed", "reason"}
+def profile_pattern(pattern, expression, growth=True):
+    previous = None
+    worst = 0.0
+    breakers = adversarial_breakers(pattern)
+    for length in PROFILE_LENGTHS:
+        elapsed = _time_fullmatch(pattern, adversarial_inputs(expression, length, breakers))
+        worst = max(worst, elapsed)
+        if elapsed > PROFILE_SLOW_SEC:
+            return {"safe": False, "length": length, "elapsed": elapsed, "reason": "매칭 시간 초과"}
+        if growth and previous and previous[1] >= PROFILE_MIN_SEC and elapsed >= PROFILE_MIN_SEC:
+            if elapsed / previous[1] > (length / previous[0]) ** PROFILE_GROWTH_POWER:
+                return {"safe": False, "length": length, "elapsed": elapsed, "reason": "초선형 증가"}
+        previous = (length, elapsed)
+    return {"safe": True, "length": PROFILE_LENGTHS[-1], "elapsed": worst, "reason": ""}
+
+# ✅ 프로파일러 자가 점검: 알려진 역추적 위험 패턴을 모두 위험으로 판정하는지 확인 → 놓친 (패턴, 표현형식) 목록
+PROFILE_SELF_CHECK = [
+    (r"(a+)+", "aaa"),
+    (r"(\d+)*$", "123"),
+    (r"([^,]+,?)+", "A,B,C"),       # GPT가 자주 만드는 목록형 패턴 (. / 부정 클래스는 \x00 꼬리를 받아들임)
+    (r"([^+]+\+?)+", "A+B+C"),
+]
+
+def profiler_self_check():
+    return [(regex, expression) for regex, expression in PROFILE_SELF_CHECK
+            if profile_pattern(re.compile(regex), expression)["safe"]]
+
+# ✅ 정규식 구조(sre 파스 트리)를 따라 일치 표본 생성 (반복은 최소+PROFILE_SAMPLE_MAX_REPEAT회까지)
+#    전후방 탐색·앵커는 건너뛰므로 일부 표본은 원래 패턴과도 불일치할 수 있음 → 두 패턴의 판정 비교에만 사용
+def positive_samples(pattern, expression=None, count=PROFILE_POSITIVE_SAMPLES, seed=0):
+    rng = random.Random(seed)
+    alphabet = "".join(dict.fromkeys(SAMPLE_ALPHABET + str(expression or "")))
+    try:
+        parsed = sre_parser.parse(pattern.pattern, pattern.flags)
+    except re.error:
+        return []
+    samples = []
+    for _ in range(count):
+        try:
+            samples.append(_sample_items(parsed, rng, alphabet, {}))
+        except ValueError:
+            continue
+    return list(dict.fromkeys(samples))
+
+def _sample_items(items, rng, alphabet, groups):
+    out = []
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            out.append(chr(av))
+        elif name == "NOT_LITERAL":
+            out.append(_sample_char([(sre_parser.NEGATE, None), (sre_parser.LITERAL, av)], rng, alphabet))
+        elif name == "ANY":
+            out.append(rng.choice(alphabet))
+        elif name == "IN":
+            out.append(_sample_char(av, rng, alphabet))
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            low, high, sub = av
+            times = rng.randint(low, min(high, low + PROFILE_SAMPLE_MAX_REPEAT))
+            out.extend(_sample_items(sub, rng, alphabet, groups) for _ in range(times))
+        elif name == "SUBPATTERN":
+            group, sub = av[0], av[-1]
+            text = _sample_items(sub, rng, alphabet, groups)
+            if group:
+                groups[group] = text
+            out.append(text)
+        elif name == "ATOMIC_GROUP":
+            out.append(_sample_items(av, rng, alphabet, groups))
+        elif name == "BRANCH":
+            out.append(_sample_items(rng.choice(av[1]), rng, alphabet, groups))
+        elif name == "GROUPREF":
+            out.append(groups.get(av, ""))
+        elif name == "GROUPREF_EXISTS":
+            group, yes, no = av
+            branch = yes if group in groups else no
+            out.append(_sample_items(branch, rng, alphabet, groups) if branch else "")
+        elif name in ("AT", "ASSERT", "ASSERT_NOT"):
+            continue
+        else:
+            raise ValueError(f"표본 생성 미지원: {name}")
+    return "".join(out)
+
+_CATEGORY_TESTS = {
+    "CATEGORY_DIGIT": str.isdecimal,
+    "CATEGORY_SPACE": str.isspace,
+    "CATEGORY_WORD": lambda ch: ch.isalnum() or ch == "_",
+}
+
+def _in_class(ch, items):
+    negate, hit = False, False
+    for op, av in items:
+        name = str(op)
+        if name == "NEGATE":
+            negate = True
+        elif name == "LITERAL":
+            hit = hit or ch == chr(av)
+        elif name == "RANGE":
+            hit = hit or av[0] <= ord(ch) <= av[1]
+        elif name == "CATEGORY":
+            category = str(av)
+            test = _CATEGORY_TESTS.get(category.replace("NOT_", ""))
+            if test is None:
+                raise ValueError(f"표본 생성 미지원: {category}")
+            hit = hit or (test(ch) != ("NOT_" in category))
+    return hit != negate
+
+def _sample_char(items, rng, alphabet):
+    candidates = list(alphabet)
+    for op, av in items:
+        if str(op) == "LITERAL":
+            candidates.append(chr(av))
+        elif str(op) == "RANGE":
+            candidates.append(chr(rng.randint(av[0], av[1])))
+    candidates = [ch for ch in candidates if _in_class(ch, items)]
+    if not candidates:
+        raise ValueError("표본 문자 없음")
+    return rng.choice(candidates)
+
+# ✅ greedy 수량자(*, +, ?, {m,n}) → 소유 수량자 (역추적 제거, Python 3.11+)
+def make_possessive(regex):
+    out, i, in_class, quantifiable = [], 0, False, False
+    while i < len(regex):
+        ch = regex[i]
+        if ch == "\\":
+            out.append(regex[i:i + 2])
+            i += 2
+            quantifiable = not in_class or quantifiable
+            continue
+        if in_class:
+            out.append(ch)
+            i += 1
+            if ch == "]":
+                in_class, quantifiable = False, True
+            continue
+        if ch == "[":
+            in_class = True
+            out.append(ch)
+            i += 1
+            for special in "^]":
+                if i < len(regex) and regex[i] == special:
+                    out.append(special)
+                    i += 1
+            continue
+
+        quantifier = None
+        if quantifiable and ch in "*+?":
+            quantifier = ch
+        elif quantifiable and ch == "{":
+            match = re.match(r"\{\d*(,\d*)?\}", regex[i:])
+            quantifier = match.group() if match else None
+        if quantifier:
+            out.append(quantifier)
+            i += len(quantifier)
+            if i < len(regex) and regex[i] in "?+":   # 이미 lazy/소유 수량자
+                out.append(regex[i])
+                i += 1
+            else:
+                out.append("+")
+            quantifiable = False
+            continue
+
+        out.append(ch)
+        i += 1
+        quantifiable = ch not in "(|^"
+    return "".join(out)
+
+# ✅ 패턴 안전성 판정 (결과는 패턴·표현형식별로 메모이즈)
+#    반환: (사용할 패턴 또는 None, 프로파일 기록)
+def safe_compile(pattern, expression=None, column=None):
+    key = (pattern.pattern, expression)
+    with _profile_lock:
+        record = _pattern_profiles.get(key)
+    if record is None:
+        profile = profile_pattern(pattern, expression)
+        record = {"정규식": pattern.pattern, "표현형식": expression, "상태": "안전", "사유": "",
+                  "최악시간(ms)": round(profile["elapsed"] * 1000, 2), "재작성정규식": None, "컬럼": set()}
+        if not profile["safe"]:
+            record["사유"] = f"{profile['reason']} (길이 {profile['length']})"
+            record["상태"] = "거부"
+            rewritten = _try_rewrite(pattern, expression)
+            if rewritten is not None:
+                record["상태"] = "재작성"
+                record["재작성정규식"] = rewritten.pattern
+            elif profile["reason"] == "초선형 증가" and profile_pattern(pattern, expression, growth=False)["safe"]:
+                # 다항 증가(예: URL 패턴의 2차 역추적)이나 최장 측정 길이에서도 시간 초과 없음 → 원래 패턴을 예산 안에서 사용
+                record["상태"] = "예산"
+    # 컬럼 기록은 보고서가 같은 잠금 아래 순회하므로 잠금 안에서 갱신
+    with _profile_lock:
+        record = _pattern_profiles.setdefault(key, record)
+        if column:
+            record["컬럼"].add(column)
+
+    if record["상태"] in ("안전", "예산"):
+        return pattern, record
+    if record["상태"] == "재작성":
+        return re.compile(record["재작성정규식"]), record
+    return None, record
+
+def _try_rewrite(pattern, expression):
+    if sys.version_info < (3, 11):
+        return None
+    try:
+        rewritten = re.compile(make_possessive(pattern.pattern))
+    except re.error:
+        return None
+    # 표현형식 예시와 구조 기반 일치 표본 모두에서 판정이 원래 패턴과 같아야 재작성 채택
+    sample = str(expression or "").strip()
+    samples = ([sample] if sample else []) + positive_samples(pattern, expression)
+    if any(bool(pattern.fullmatch(text)) != bool(rewritten.fullmatch(text)) for text in samples):
+        return None
+    return rewritten if profile_pattern(rewritten, expression)["safe"] else None
+
+# ✅ 배치 단위 매칭 + 남은 시간 예산 → (일치 여부, 검사 완료 여부) bool 배열
+def match_with_budget(values, pattern, budget=COLUMN_MATCH_BUDGET_SEC):
+    matched = np.ones(len(values), dtype=bool)
+    checked = np.zeros(len(values), dtype=bool)
+    start = time.perf_counter()
+    for begin in range(0, len(values), MATCH_BATCH_ROWS):
+        if time.perf_counter() - start >= budget:
+            break
+        end = begin + MATCH_BATCH_ROWS
+        matched[begin:end] = values.iloc[begin:end].str.fullmatch(pattern).to_numpy(dtype=bool)
+        checked[begin:end] = True
+    return matched, checked
+
+# ✅ 검증 1회 시작 시 규칙별 예산 사용량 초기화
+def reset_match_budget(rules):
+    for rule in rules.values():
+        rule["spent"] = 0.0
+        rule["skipped"] = 0
+    return rules
+
+# ✅ 시간 예산 초과로 형식 검사를 생략한 셀 수 {컬럼: 셀 수}
+def skipped_cells(rules):
+    return {col: rule["skipped"] for col, rule in rules.items() if rule.get("skipped")}
+
+# 관리자 보기용 기록은 부모 프로세스에서만 (워커의 기록은 부모에 전달되지 않으므로 병합 시점에 기록)
+def record_slow_rule(standard, column, rule):
+    _slow_rules[(standard, column)] = {
+        "표준": standard, "컬럼": column, "정규식": rule["pattern"].pattern,
+        "생략셀": int(rule["skipped"]), "소요(초)": round(rule["spent"], 2),
+    }
+
+def pattern_profile_report():
+    with _profile_lock:
+        records = [dict(r, 컬럼=", ".join(sorted(r["컬럼"]))) for r in _pattern_profiles.values() if r["상태"] != "안전"]
+    return pd.DataFrame(records)
+
+def slow_rule_report():
+    return pd.DataFrame(list(_slow_rules.values()))
+
+# ✅ 컬럼 규칙 컴파일 (메타 사전 1개 컬럼 → 검증 규칙 1회 생성)
+def compile_column_rule(meta_col, col=None):
+    rule = {
+        "required": meta_col.get("필수여부") == "필수",
+        "conditional": None,
+        "kind": None,          # "regex" | "allowed" | "gpt" | None
+        "pattern": None,
+        "pattern_error": None,
+        "allowed": None,
+        "label": "형식 오류",
+    }
+
+    조건부 = meta_col.get("조건부필수")
+    if 조건부:
+        기준필드, 기준값들 = list(조건부.items())[0]
+        rule["conditional"] = (기준필드, frozenset(str(v).strip().upper() for v in 기준값들))
+
+    # ✅ 정규식 → 허용값 → GPT(description) 우선순위는 validate_cell과 동일
+    regex = meta_col.get("정규식")
+    allowed = meta_col.get("허용값")
+    generated = meta_col.get("정규식출처") == GPT_SOURCE
+    if regex or generated:
+        _compile_pattern(rule, regex, generated, meta_col.get("표현형식"), col)
+    elif allowed:
+        rule["kind"] = "allowed"
+        rule["allowed"] = frozenset(str(v).strip().upper() for v in allowed)
+    elif meta_col.get("설명"):
+        rule["kind"] = "gpt"
+    return rule
+
+def _compile_pattern(rule, regex, generated, expression=None, col=None):
+    rule["kind"] = "regex"
+    rule["label"] = "형식 오류(GPT)" if generated else "형식 오류"
+    try:
+        pattern = re.compile(regex)
+    except Exception as e:
+        rule["pattern_error"] = f"{'GPT 정규식' if generated else '정규식'} 오류 ({e})"
+        return
+    rule["pattern"], profile = safe_compile(pattern, expression, col)
+    rule["budgeted"] = profile["상태"] in ("재작성", "예산")
+    if rule["pattern"] is None:
+        rule["kind"] = None   # 역추적 위험 패턴 거부 → 형식 검사 생략 (관리자 보기에서 확인)
+        rule["unsafe"] = profile["사유"]
+
+def compile_meta_rules(meta):
+    return {col: compile_column_rule(meta_col, col) for col, meta_col in meta.items() if isinstance(meta_col, dict)}
+
+# ✅ 사전 생성되지 않은 설명 컬럼은 값이 있을 때만 GPT 정규식을 1회 생성 (meta에 캐싱)
+def resolve_gpt_rule(rule, col, meta_col, standard=None):
+    regex = get_generated_regex(standard, col, meta_col)
+    if regex:
+        meta_col["정규식"] = regex  # 캐싱
+    meta_col["정규식출처"] = GPT_SOURCE
+    _compile_pattern(rule, regex, True, meta_col.get("표현형식"), col)
+
+def _clean_values(series):
+    # ✅ validate_cell의 str(val).strip() 과 동일한 정규화 (str 액세서는 파이썬 re 기준으로 동작하도록 object 유지)
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip().astype(object)
+
+# ✅ 단일 컬럼 검증 → 오류 메시지 Series (오류 없는 셀은 None)
+def validate_column(df, col, rule, meta_col=None, standard=None):
+    values = _clean_values(df[col])
+    upper = values.str.upper()
+    empty = upper.isin(EMPTY_TOKENS).to_numpy()
+    messages = pd.Series(None, index=df.index, dtype=object)
+
+    if rule["required"]:
+        messages[empty] = "필수값 누락"
+    elif rule["conditional"]:
+        기준필드, 기준값들 = rule["conditional"]
+        if 기준필드 in df.columns:
+            condition = _clean_values(df[기준필드]).str.upper().isin(기준값들).to_numpy()
+        else:
+            condition = "" in 기준값들
+        messages[empty & condition] = "조건부 필수 누락"
+
+    filled = ~empty
+    if rule["kind"] is None or not filled.any():
+        return messages
+
+    if rule["kind"] == "allowed":
+        messages[filled & ~upper.isin(rule["allowed"]).to_numpy()] = "허용값 오류"
+        return messages
+
+    if rule["kind"] == "gpt":
+        resolve_gpt_rule(rule, col, meta_col or {}, standard)
+        if rule["kind"] is None:
+            return messages
+
+    if rule["pattern_error"]:
+        messages[filled] = rule["pattern_error"]
+    elif not rule.get("budgeted"):
+        bad = filled.copy()
+        bad[filled] = ~values[filled].str.fullmatch(rule["pattern"]).to_numpy(dtype=bool)
+        messages[bad] = rule["label"]
+    else:
+        start = time.perf_counter()
+        matched, checked = match_with_budget(values[filled], rule["pattern"], COLUMN_MATCH_BUDGET_SEC - rule.get("spent", 0.0))
+        rule["spent"] = rule.get("spent", 0.0) + time.perf_counter() - start
+        if not checked.all():
+            rule["skipped"] = rule.get("skipped", 0) + int((~checked).sum())
+            if not _worker_state:
+                record_slow_rule(standard, col, rule)
+        bad = filled.copy()
+        bad[filled] = ~matched
+        messages[bad] = rule["label"]
+    return messages
+
+def empty_errors():
+    return pd.DataFrame({"행": pd.Series(dtype="int64"), "컬럼": pd.Series(dtype=object), "오류": pd.Series(dtype=object)})
+
+# ✅ 전체 검증 (희소 오류 행렬: 오류가 있는 셀만 [행, 컬럼, 오류] 로 반환, 행은 엑셀 행번호)
+#    row_offset: 청크 검증 시 앞선 청크까지의 행 수
+def validate_dataframe(df, meta, rules=None, standard=None, row_offset=0, table_rules=None):
+    rules = rules if rules is not None else compile_meta_rules(meta)
+    frames = []
+    for pos, col in enumerate(df.columns):
+        rule = rules.get(col)
+        if not rule:
+            continue
+        messages = validate_column(df, col, rule, meta.get(col), standard)
+        hit = messages.notna().to_numpy()
+        if hit.any():
+            frames.append(pd.DataFrame({
+                "행": np.flatnonzero(hit) + 2 + row_offset,
+                "컬럼": col,
+                "오류": messages.to_numpy()[hit],
+            }))
+
+    if table_rules:
+        frames.append(apply_table_rules(df, table_rules, row_offset))
+    return sort_errors(frames, df.columns)
+
+# ✅ 오류 조각들을 (행, 컬럼 순서) 기준으로 병합 — 같은 셀은 먼저 나온 오류가 앞
+def sort_errors(frames, columns):
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return empty_errors()
+    errors = pd.concat(frames, ignore_index=True)
+    errors["컬럼순서"] = errors["컬럼"].map({col: i for i, col in enumerate(columns)})
+    errors = errors.sort_values(["행", "컬럼순서"], kind="stable", ignore_index=True)
+    return errors[ERROR_COLUMNS]
+
+# ─────────────────────────────────────────────
+# ✅ 행 간 검사 규칙 (키 중복 / 시도·시군구 참조) — 해시 기반 선형 시간
+#    규칙 dict에 이전 청크까지의 상태를 보관하므로 검증 1회마다 새로 컴파일
+# ─────────────────────────────────────────────
+REGION_REF_PATH = os.path.join(META_DIR, "0. 대한민국_시도_시군구.json")
+KEY_COLUMN_CANDIDATES = ["관리번호"]
+ADDRESS_COLUMN_CANDIDATES = ["소재지도로명주소", "소재지지번주소", "도로명주소", "지번주소", "주소"]
+# 명칭이 바뀐 시도 → 참조 파일 명칭
+SIDO_ALIASES = {"강원특별자치도": "강원도", "전북특별자치도": "전라북도"}
+KEY_SEPARATOR = "\x1f"
+REGION_BBOX_PATH = os.path.join(BASE_DIR, "data", "reference", "region_bbox.json")
+BBOX_MARGIN_DEG = 0.03        # 경계 근처 좌표 오탐 방지 여유 (약 3km)
+
+_region_index = {}
+_bbox_index = {}
+
+# ✅ 시도/시군구 참조 인덱스 (1회 빌드): "전라북도 전주시 완산구" 같은 항목은 시도를 뗀 형태와 시도 매핑도 등록
+#    참조 파일의 "전체수록시도"에 든 시도만 시군구 목록이 완전하다고 보고 목록 외 시군구를 오류로 판정
+#    (기본 동봉 파일은 일부 시군구만 수록 → 목록 외 이름은 오류로 보지 않고 시도-시군구 불일치만 검사)
+#    시도 약칭(서울, 충북 …)과 바뀐 명칭은 좌표 범위 검사와 같은 표(시도약칭 + SIDO_ALIASES)로 참조 명칭에 맞춤
+def get_region_index():
+    if _region_index:
+        return _region_index
+    with open(REGION_REF_PATH, encoding="utf-8") as f:
+        ref = json.load(f)
+    sido = frozenset(ref.get("시도", []))
+    sido_names = {**get_bbox_index()["sido_short"], **SIDO_ALIASES}
+    prefix = re.compile(r"^(" + "|".join(map(re.escape, sorted(sido | set(sido_names), key=len, reverse=True))) + r")\s+")
+    sigungu, sigungu_sido = set(), {}
+    for name in ref.get("시군구", []):
+        name = " ".join(name.split())
+        sigungu.add(name)
+        match = prefix.match(name)
+        if match:
+            short = name[match.end():]
+            sigungu.add(short)
+            sigungu_sido[short] = sido_names.get(match.group(1), match.group(1))
+    complete_sido = frozenset(sido_names.get(name, name) for name in ref.get("전체수록시도", []))
+    _region_index.update(
+        sido=sido, sido_names=sido_names, sigungu=frozenset(sigungu), sigungu_sido=sigungu_sido,
+        prefix=prefix, complete_sido=complete_sido,
+    )
+    return _region_index
+
+# ✅ 참조 파일이 시군구를 전부 수록한 시도가 있어야 목록 외 시군구(소속) 검사가 동작
+def region_membership_check_enabled():
+    return bool(get_region_index()["complete_sido"])
+
+# ✅ 좌표 범위 인덱스 (1회 빌드): 시군구/시도 이름 → 범위 배열의 행 번호, 마지막 행은 "범위 없음"(NaN)
+def get_bbox_index():
+    if _bbox_index:
+        return _bbox_index
+    with open(REGION_BBOX_PATH, encoding="utf-8") as f:
+        ref = json.load(f)
+    names = list(ref["시군구"]) + list(ref["시도"])
+    bounds = np.array([ref["시군구"].get(name) or ref["시도"][name] for name in names] + [[np.nan] * 4], dtype=float)
+    short = pd.Series([name.split()[-1] for name in ref["시군구"]])
+    unique_short = short[~short.duplicated(keep=False)]
+    _bbox_index.update(
+        korea=np.array(ref["대한민국"], dtype=float),
+        bounds=bounds,
+        names=np.array(names + [""], dtype=object),
+        sigungu={name: i for i, name in enumerate(ref["시군구"])},
+        sigungu_short={name: ref_i for ref_i, name in zip(unique_short.index, unique_short)},
+        sido={name: len(ref["시군구"]) + i for i, name in enumerate(ref["시도"])},
+        sido_short=ref.get("시도약칭", {}),
+    )
+    return _bbox_index
+
+# ✅ 이 데이터셋의 식별자 컬럼: "관리번호" 그대로 → 설명이 이 데이터셋 식별용이라고 밝힌 …관리번호 컬럼
+#    "기본정보 데이터셋의 식별자"처럼 다른 데이터셋을 가리키는 관리번호는 반복되는 외래키이므로 제외, 없으면 빈 목록
+KEY_DATASET_PATTERN = re.compile(r"([^\s\"(]+)(?:\([^)]*\))?\s*데이터셋의\s*식별")
+
+def _identifies_dataset(description, standard):
+    if "식별" not in description:
+        return False
+    named = KEY_DATASET_PATTERN.search(description)
+    return named is None or named.group(1) in str(standard or "").replace(" ", "")
+
+def detect_key_columns(columns, meta=None, standard=None):
+    columns = list(columns)
+    for col in KEY_COLUMN_CANDIDATES:
+        if col in columns:
+            return [col]
+    for col in columns:
+        meta_col = (meta or {}).get(col)
+        description = str(meta_col.get("설명") or "") if isinstance(meta_col, dict) else ""
+        if col.replace(" ", "").endswith("관리번호") and _identifies_dataset(description, standard):
+            return [col]
+    return []
+
+def detect_region_columns(columns):
+    sido = next((col for col in columns if col.endswith("시도명") and "교육청" not in col), None)
+    sigungu = next((col for col in columns if col.endswith("시군구명")), None)
+    return sido, sigungu
+
+# ✅ 위도/경도 컬럼 쌍 (예: 위도/경도, 설치위도/설치경도). 표현형식 예시가 도(°) 단위가 아니면(TM 좌표 등) 제외
+def detect_coordinate_columns(columns, meta=None):
+    columns = list(columns)
+    pairs = []
+    for lat in columns:
+        if "위도" not in lat or lat.replace("위도", "경도") not in columns:
+            continue
+        lon = lat.replace("위도", "경도")
+        examples = [((meta or {}).get(col) or {}).get("표현형식") for col in (lat, lon)]
+        try:
+            if any(example and abs(float(str(example).strip())) > 180 for example in examples):
+                continue
+        except ValueError:
+            pass
+        pairs.append((lat, lon))
+    return pairs
+
+def compile_table_rules(columns, key_columns=None, check_regions=False, check_coordinates=False, meta=None):
+    table_rules = []
+    if key_columns:
+        table_rules.append({"kind": "unique", "columns": list(key_columns), "seen": {}})
+    if check_regions:
+        sido, sigungu = detect_region_columns(columns)
+        if sido:
+            table_rules.append({"kind": "sido", "column": sido})
+        if sigungu:
+            table_rules.append({"kind": "sigungu", "column": sigungu, "sido_column": sido})
+    if check_coordinates:
+        sido, sigungu = detect_region_columns(columns)
+        address = next((col for col in ADDRESS_COLUMN_CANDIDATES if col in columns), None)
+        for lat, lon in detect_coordinate_columns(columns, meta):
+            table_rules.append({
+                "kind": "coords", "column": lat, "lon_column": lon,
+                "sido_column": sido, "sigungu_column": sigungu, "address_column": address,
+            })
+    return table_rules
+
+def _filled(values):
+    return ~values.str.upper().isin(EMPTY_TOKENS).to_numpy()
+
+# 약칭·바뀐 명칭 → 참조 명칭 (replace(dict)는 object 열에서 다운캐스팅 경고를 내므로 map 사용)
+def _normalize_sido(values):
+    names = get_region_index()["sido_names"]
+    return values.map(lambda name: names.get(name, name))
+
+# ✅ 키 중복: 키 해시(factorize) + groupby 1회로 청크 내 첫 행 계산, 이전 청크는 해시 맵으로 조회
+def _check_unique(df, rule, row_offset):
+    cols = rule["columns"]
+    if any(col not in df.columns for col in cols):
+        return None
+    parts = [_clean_values(df[col]) for col in cols]
+    keys = parts[0] if len(parts) == 1 else parts[0].str.cat(parts[1:], sep=KEY_SEPARATOR)
+    blank = np.logical_and.reduce([~_filled(part) for part in parts])
+    rows = np.arange(len(df)) + 2 + row_offset
+
+    codes, _ = pd.factorize(keys)
+    first_rows = pd.Series(rows).groupby(codes).transform("min").to_numpy()
+    seen = rule["seen"]
+    if seen:
+        previous = keys.map(seen).to_numpy(dtype=float)
+        first_rows = np.where(np.isnan(previous), first_rows, previous).astype(np.int64)
+
+    new_keys = (first_rows == rows) & ~blank
+    seen.update(zip(keys.to_numpy()[new_keys], rows[new_keys]))
+
+    duplicated = (first_rows != rows) & ~blank
+    if not duplicated.any():
+        return None
+    label = "+".join(cols)
+    return pd.DataFrame({
+        "행": rows[duplicated],
+        "컬럼": cols[0],
+        "오류": [f"중복 키 ({label}, {first}행과 중복)" for first in first_rows[duplicated]],
+    })
+
+# ✅ 시도명: 참조 시도 집합 소속 여부 (약칭은 정식 명칭으로 바꿔 조회)
+def _check_sido(df, rule, row_offset):
+    col = rule["column"]
+    if col not in df.columns:
+        return None
+    index = get_region_index()
+    values = _normalize_sido(_clean_values(df[col]))
+    bad = _filled(values) & ~values.isin(index["sido"]).to_numpy()
+    if not bad.any():
+        return None
+    return pd.DataFrame({"행": np.flatnonzero(bad) + 2 + row_offset, "컬럼": col, "오류": "시도명 참조 오류"})
+
+# ✅ 시군구명: 앞에 붙은 시도명은 떼고 참조 집합 조회
+#    시도-시군구 불일치: 값 앞 시도명(약칭 포함) 또는 참조로 시도가 특정되는 시군구가 시도 컬럼과 다를 때
+#    목록 외 시군구는 행의 시도(값 앞 시도명 → 시도 컬럼)가 전체 수록된 시도일 때만 오류
+def _check_sigungu(df, rule, row_offset):
+    col = rule["column"]
+    if col not in df.columns:
+        return None
+    index = get_region_index()
+    raw = _clean_values(df[col]).str.replace(r"\s+", " ", regex=True)
+    values = raw.str.replace(index["prefix"], "", regex=True)
+    filled = _filled(values)
+    messages = pd.Series(None, index=df.index, dtype=object)
+
+    sido_col = rule.get("sido_column")
+    actual = _normalize_sido(_clean_values(df[sido_col])) if sido_col and sido_col in df.columns else None
+    prefix_sido = _normalize_sido(raw.str.extract(index["prefix"], expand=False))
+    if index["complete_sido"]:
+        row_sido = prefix_sido.where(prefix_sido.notna(), actual) if actual is not None else prefix_sido
+        unknown = filled & ~values.isin(index["sigungu"]).to_numpy() & row_sido.isin(index["complete_sido"]).to_numpy()
+        messages[unknown] = "시군구명 참조 오류"
+
+    if actual is not None:
+        expected = prefix_sido.where(prefix_sido.notna(), values.map(index["sigungu_sido"]))
+        mismatch = (expected.notna() & _filled(actual) & (expected != actual)).to_numpy() & filled
+        messages[mismatch & messages.isna().to_numpy()] = "시도-시군구 불일치"
+
+    hit = messages.notna().to_numpy()
+    if not hit.any():
+        return None
+    return pd.DataFrame({"행": np.flatnonzero(hit) + 2 + row_offset, "컬럼": col, "오류": messages.to_numpy()[hit]})
+
+def _inside(lat, lon, bounds, margin=0.0):
+    return (
+        (lat >= bounds[..., 0] - margin) & (lat <= bounds[..., 1] + margin)
+        & (lon >= bounds[..., 2] - margin) & (lon <= bounds[..., 3] + margin)
+    )
+
+# ✅ 행별 신고 지역 → 좌표 범위 행 번호: 시도+시군구 → 시군구(이름 유일할 때) → 시도 순으로 조회
+#    시도/시군구 컬럼이 없으면 주소 앞 두 어절(시도 약칭 포함)로 대신함
+#    지역 값은 종류가 적으므로 고유값(쌍)만 조회하고 코드 배열로 펼침
+def _unique_tokens(series, fn):
+    codes, uniques = pd.factorize(series.fillna(""))
+    tokens = fn(_clean_values(pd.Series(uniques, dtype=object)))
+    return [part.fillna("").to_numpy(dtype=object)[codes] for part in tokens]
+
+def _resolve_region_row(sido, sigungu, index, missing):
+    sido = get_region_index()["sido_names"].get(sido, sido)
+    if sigungu:
+        row = index["sigungu"].get(f"{sido} {sigungu}", index["sigungu_short"].get(sigungu))
+        if row is not None:
+            return row
+    return index["sido"].get(sido, missing)
+
+def _declared_region_rows(df, rule):
+    index = get_bbox_index()
+    missing = len(index["names"]) - 1
+    sido = sigungu = None
+    if rule.get("sido_column") in df.columns:
+        sido, = _unique_tokens(df[rule["sido_column"]], lambda u: [u])
+    if rule.get("sigungu_column") in df.columns:
+        sigungu, = _unique_tokens(df[rule["sigungu_column"]], lambda u: [u.str.split().str[-1]])
+    if (sido is None or sigungu is None) and rule.get("address_column") in df.columns:
+        first, second = _unique_tokens(
+            df[rule["address_column"]], lambda u: [u.str.extract(r"^(\S+)\s+(\S+)")[i] for i in (0, 1)]
+        )
+        sido = sido if sido is not None else first
+        sigungu = sigungu if sigungu is not None else second
+    if sido is None and sigungu is None:
+        return np.full(len(df), missing)
+
+    sido_codes, sido_names = pd.factorize(sido if sido is not None else np.full(len(df), "", dtype=object))
+    sigungu_codes, sigungu_names = pd.factorize(sigungu if sigungu is not None else np.full(len(df), "", dtype=object))
+    width = len(sigungu_names)
+    pair_codes, pairs = pd.factorize(sido_codes.astype(np.int64) * width + sigungu_codes)
+    lookup = np.array(
+        [_resolve_region_row(sido_names[p // width], sigungu_names[p % width], index, missing) for p in pairs],
+        dtype=np.int64,
+    )
+    return lookup[pair_codes]
+
+# ✅ 위도/경도: 숫자 변환 후 국외 좌표, 위도·경도 뒤바뀜, 신고 시군구(또는 시도) 범위 밖 좌표를 일괄 판정
+#    숫자가 아닌 값은 형식 검사에 맡기고 여기서는 건너뜀. 오류는 위도 컬럼에 표시
+def _check_coordinates(df, rule, row_offset):
+    lat_col, lon_col = rule["column"], rule["lon_column"]
+    if lat_col not in df.columns or lon_col not in df.columns:
+        return None
+    index = get_bbox_index()
+    lat = pd.to_numeric(_clean_values(df[lat_col]), errors="coerce").to_numpy(dtype=float)
+    lon = pd.to_numeric(_clean_values(df[lon_col]), errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(lat) & ~np.isnan(lon)
+
+    in_korea = _inside(lat, lon, index["korea"])
+    swapped = valid & ~in_korea & _inside(lon, lat, index["korea"])
+    abroad = valid & ~in_korea & ~swapped
+    regions = _declared_region_rows(df, rule)
+    bounds = index["bounds"][regions]
+    outside = valid & in_korea & ~np.isnan(bounds[:, 0]) & ~_inside(lat, lon, bounds, BBOX_MARGIN_DEG)
+
+    hit = swapped | abroad | outside
+    if not hit.any():
+        return None
+    messages = np.where(swapped, "위도·경도 뒤바뀜", "좌표 범위 오류(국외)").astype(object)
+    region_names = index["names"][regions]
+    messages[outside] = "좌표가 신고 지역(" + region_names[outside] + ") 범위 밖"
+    return pd.DataFrame({"행": np.flatnonzero(hit) + 2 + row_offset, "컬럼": lat_col, "오류": messages[hit]})
+
+TABLE_CHECKS = {"unique": _check_unique, "sido": _check_sido, "sigungu": _check_sigungu, "coords": _check_coordinates}
+
+# ✅ 행 간 규칙 적용 (청크는 행 순서대로 넣어야 중복 상태가 맞게 누적됨)
+def apply_table_rules(df, table_rules, row_offset=0):
+    frames = [TABLE_CHECKS[rule["kind"]](df, rule, row_offset) for rule in table_rules]
+    return sort_errors([f for f in frames if f is not None], df.columns)
+
+# ─────────────────────────────────────────────
+# ✅ 멀티프로세스 검증 (행 분할 → 프로세스 풀, 워커마다 컴파일된 규칙은 1회만 전달)
+# ─────────────────────────────────────────────
+PARALLEL_CHUNK_ROWS = 100_000
+_worker_state = {}
+
+def _init_validation_worker(meta, rules, standard):
+    _worker_state.update(meta=meta, rules=rules, standard=standard)
+
+# ✅ spent: 제출 시점까지 부모에서 누적된 컬럼별 예산 사용량 → 이 파티션에서 추가로 쓴 양만 돌려줌
+def _validate_partition(part, row_offset, spent):
+    rules = _worker_state["rules"]
+    for col, used in spent.items():
+        rules[col].update(spent=used, skipped=0)
+    errors = validate_dataframe(part, _worker_state["meta"], rules, _worker_state["standard"], row_offset)
+    usage = {col: (rules[col]["spent"] - used, rules[col]["skipped"]) for col, used in spent.items()}
+    return errors, usage
+
+def _budget_snapshot(rules):
+    return {col: rule.get("spent", 0.0) for col, rule in rules.items() if rule["kind"] == "regex" and rule.get("budgeted")}
+
+# ✅ 워커에서 GPT를 호출하지 않도록 설명 컬럼 정규식은 부모 프로세스에서 먼저 확정
+def _resolve_pending_rules(columns, meta, rules, standard):
+    for col in columns:
+        rule = rules.get(col)
+        if rule and rule["kind"] == "gpt":
+            resolve_gpt_rule(rule, col, meta.get(col) or {}, standard)
+
+# ✅ 청크 순서대로 (청크 행 수, 오류) 반환. workers > 1 이면 프로세스 풀에서 병렬 처리하되
+#    동시에 처리 중인 청크는 workers * 2개로 제한하여 메모리 상한 유지
+#    행 간 규칙(table_rules)은 상태가 있으므로 항상 부모 프로세스에서 청크 순서대로 적용
+#    정규식 시간 예산은 파티션 결과를 받을 때 부모 규칙에 합산 (동시 처리 중인 파티션만큼은 예산을 넘길 수 있음)
+def iter_validated_chunks(chunks, meta, rules, standard=None, workers=1, table_rules=None):
+    offset = 0
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), validate_dataframe(chunk, meta, rules, standard, offset, table_rules)
+            offset += len(chunk)
+        return
+
+    pool = None
+    pending = deque()
+    try:
+        for chunk in chunks:
+            if pool is None:
+                _resolve_pending_rules(chunk.columns, meta, rules, standard)
+                pool = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_validation_worker, initargs=(meta, rules, standard)
+                )
+            table_errors = apply_table_rules(chunk, table_rules, offset) if table_rules else None
+            future = pool.submit(_validate_partition, chunk, offset, _budget_snapshot(rules))
+            pending.append((chunk.columns, len(chunk), table_errors, future))
+            offset += len(chunk)
+            if len(pending) >= workers * 2:
+                yield _collect_partition(pending.popleft(), rules, standard)
+        while pending:
+            yield _collect_partition(pending.popleft(), rules, standard)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def _collect_partition(item, rules, standard):
+    columns, rows, table_errors, future = item
+    errors, usage = future.result()
+    for col, (spent, skipped) in usage.items():
+        rule = rules[col]
+        rule["spent"] = rule.get("spent", 0.0) + spent
+        if skipped:
+            rule["skipped"] = rule.get("skipped", 0) + skipped
+            record_slow_rule(standard, col, rule)
+    if table_errors is not None:
+        errors = sort_errors([errors, table_errors], columns)
+    return rows, errors
+
+def _concat_errors(frames):
+    frames = [f for f in frames if len(f)]
+    return pd.concat(frames, ignore_index=True) if frames else empty_errors()
+
+def validate_dataframe_parallel(df, meta, rules=None, standard=None, workers=None, chunk_rows=PARALLEL_CHUNK_ROWS, table_rules=None):
+    rules = rules if rules is not None else compile_meta_rules(meta)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(df) <= chunk_rows:
+        return validate_dataframe(df, meta, rules, standard, table_rules=table_rules)
+    parts = (df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+    return _concat_errors(errors for _, errors in iter_validated_chunks(parts, meta, rules, standard, workers, table_rules))
+
+def errors_to_cells(errors):
+    return list(zip(errors["행"].tolist(), errors["컬럼"].tolist(), errors["오류"].tolist()))
+
 # ✅ 전체 검증 실행 함수
-def run_meta_validation(df, meta):
+def run_meta_validation(df, meta, standard=None, rules=None, workers=1, table_rules=None):
+    if workers != 1:
+        return errors_to_cells(validate_dataframe_parallel(df, meta, rules, standard, workers, table_rules=table_rules))
+    return errors_to_cells(validate_dataframe(df, meta, rules, standard, table_rules=table_rules))
+
+# ─────────────────────────────────────────────
+# ✅ 증분 재검증 (수정 후 재업로드 시 바뀐 행만 다시 검증)
+#    행 내용 해시 → 직전 검증의 행별 판정을 (표준, 규칙 지문) 단위로 보관
+#    컬럼 규칙 결과만 재사용하고, 행 간 규칙(키 중복·시도/시군구)은 전체 행에 다시 적용
+# ─────────────────────────────────────────────
+INCREMENTAL_STORE_SIZE = 8
+
+_verdict_store = BoundedLRU(INCREMENTAL_STORE_SIZE)
+
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+# ✅ 규칙 지문: 표준 + 컬럼 순서 + 컴파일된 규칙 내용 (GPT 정규식이 바뀌면 다른 지문)
+def rules_fingerprint(standard, columns, rules):
+    parts = [standard, tuple(columns)]
+    for col in columns:
+        rule = rules.get(col)
+        if not rule:
+            continue
+        conditional = rule["conditional"]
+        parts.append((
+            col, rule["kind"], rule["required"], rule["label"], rule["pattern_error"],
+            getattr(rule["pattern"], "pattern", None),
+            sorted(rule["allowed"]) if rule["allowed"] else None,
+            (conditional[0], sorted(conditional[1])) if conditional else None,
+        ))
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+def begin_incremental_run(standard, columns, meta, rules):
+    _resolve_pending_rules(columns, meta, rules, standard)
+    key = (standard, rules_fingerprint(standard, columns, rules))
+    previous = _verdict_store.get(key)
+    return {"key": key, "previous": previous, "rules": rules, "hashes": [], "errors": [], "reused": 0, "validated": 0}
+
+# ✅ 청크 행 분류: (행 해시, 이전 실행에 있던 행 여부, 새로 검증할 행 위치)
+def _classify_rows(run, chunk):
+    hashes = row_hashes(chunk)
+    previous = run["previous"]
+    known = np.isin(hashes, previous["hashes"]) if previous is not None else np.zeros(len(chunk), dtype=bool)
+    return hashes, known, np.flatnonzero(~known)
+
+# ✅ 청크 1개 증분 검증: 이전 실행에 없던 행만 검증하고, 나머지는 해시로 이전 오류를 찾아 현재 행 번호로 펼침
+def validate_chunk_incremental(run, chunk, meta, rules, standard=None, row_offset=0, table_rules=None, workers=1):
+    hashes, known, fresh = _classify_rows(run, chunk)
+    new_errors = validate_dataframe_parallel(chunk.iloc[fresh], meta, rules, standard, workers) if len(fresh) else empty_errors()
+    table_errors = apply_table_rules(chunk, table_rules, row_offset) if table_rules else None
+    return _merge_incremental_chunk(run, chunk, row_offset, hashes, known, fresh, new_errors, 0, table_errors)
+
+# new_errors: 새 행만 모은 부분 DataFrame 기준 오류 (fresh_offset: 그 부분이 검증 입력에서 시작한 행 수)
+def _merge_incremental_chunk(run, chunk, row_offset, hashes, known, fresh, new_errors, fresh_offset=0, table_errors=None):
+    previous = run["previous"]
+    frames = []
+    if len(new_errors):
+        new_errors = new_errors.copy()
+        # 부분 DataFrame 기준 행 번호 → 청크 내 위치 → 엑셀 행 번호
+        new_errors["행"] = fresh[new_errors["행"].to_numpy(dtype=np.int64) - 2 - fresh_offset] + 2 + row_offset
+        frames.append(new_errors)
+    if known.any():
+        positions = np.flatnonzero(known)
+        reused = pd.DataFrame({"해시": hashes[positions], "행": positions + 2 + row_offset})
+        frames.append(reused.merge(previous["errors"], on="해시")[ERROR_COLUMNS])
+    if table_errors is not None:
+        frames.append(table_errors)
+
+    # 다음 실행용 판정 보관 (이번 파일에 있는 행만)
+    run["hashes"].append(hashes)
+    run["errors"].append(pd.DataFrame({
+        "해시": hashes[new_errors["행"].to_numpy(dtype=np.int64) - 2 - row_offset],
+        "컬럼": new_errors["컬럼"].to_numpy(),
+        "오류": new_errors["오류"].to_numpy(),
+    }))
+    run["reused"] += int(known.sum())
+    run["validated"] += len(fresh)
+    return sort_errors(frames, chunk.columns)
+
+# ✅ 이번 실행의 행별 판정을 저장 → 다음 재업로드의 기준 (이전 판정은 이번 파일에 남은 행만 이어받음)
+#    시간 예산 초과로 검사를 생략한 셀이 있으면 "오류 없음"으로 재사용하지 않도록 저장하지 않음
+def finish_incremental_run(run):
+    stats = {"재사용행": run["reused"], "검증행": run["validated"]}
+    if skipped_cells(run["rules"]):
+        _verdict_store.pop(run["key"])
+        return stats
+    hashes = np.unique(np.concatenate(run["hashes"])) if run["hashes"] else np.array([], dtype=np.uint64)
+    errors = [f for f in run["errors"] if len(f)]
+    previous = run["previous"]
+    if previous is not None and len(previous["errors"]):
+        errors.append(previous["errors"][np.isin(previous["errors"]["해시"].to_numpy(), hashes)])
+    errors = (
+        pd.concat(errors, ignore_index=True).drop_duplicates(["해시", "컬럼"], ignore_index=True)
+        if errors else pd.DataFrame({"해시": np.array([], dtype=np.uint64), "컬럼": [], "오류": []})
+    )
+    _verdict_store.put(run["key"], {"hashes": hashes, "errors": errors})
+    return stats
+
+# ✅ 스트리밍 증분 검증: 청크별 새 행만 모아 iter_validated_chunks의 프로세스 풀 1개로 검증
+#    (청크가 PARALLEL_CHUNK_ROWS보다 작아도 병렬 처리됨). 행 간 규칙은 부모에서 청크 순서대로 적용
+def iter_incremental_chunks(run, chunks, meta, rules, standard=None, workers=1, table_rules=None):
+    prepared = deque()
+
+    def fresh_parts():
+        offset = fresh_offset = 0
+        for chunk in chunks:
+            hashes, known, fresh = _classify_rows(run, chunk)
+            table_errors = apply_table_rules(chunk, table_rules, offset) if table_rules else None
+            prepared.append((chunk, offset, hashes, known, fresh, fresh_offset, table_errors))
+            offset += len(chunk)
+            fresh_offset += len(fresh)
+            yield chunk.iloc[fresh]
+
+    for _, new_errors in iter_validated_chunks(fresh_parts(), meta, rules, standard, workers):
+        chunk, offset, hashes, known, fresh, fresh_offset, table_errors = prepared.popleft()
+        yield len(chunk), _merge_incremental_chunk(run, chunk, offset, hashes, known, fresh, new_errors, fresh_offset, table_errors)
+
+def validate_dataframe_incremental(df, meta, rules=None, standard=None, table_rules=None, workers=1):
+    rules = rules if rules is not None else compile_meta_rules(meta)
+    run = begin_incremental_run(standard, df.columns, meta, rules)
+    errors = validate_chunk_incremental(run, df, meta, rules, standard, 0, table_rules, workers)
+    return errors, finish_incremental_run(run)
+
+# ─────────────────────────────────────────────
+# ✅ 대용량 CSV 스트리밍 검증 (샘플 기반 인코딩 판별 + 청크 단위 검증)
+# ─────────────────────────────────────────────
+ENCODING_SAMPLE_BYTES = 1024 * 1024
+STREAMING_CHUNK_ROWS = 50_000
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+# ✅ 인코딩 판별: utf-8 → cp949 순으로 샘플 디코딩 시도, 실패 시 샘플에만 chardet 적용
+def detect_encoding(sample):
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ("utf-8", "cp949"):
+        try:
+            # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return chardet.detect(sample)["encoding"] or "utf-8"
+
+def detect_file_encoding(file):
+    file.seek(0)
+    sample = file.read(ENCODING_SAMPLE_BYTES)
+    file.seek(0)
+    return detect_encoding(sample)
+
+def normalize_columns(df):
+    df.columns = [str(col).strip().replace(" ", "") for col in df.columns]
+    return df
+
+def read_csv_header(file, encoding):
+    file.seek(0)
+    header = normalize_columns(pd.read_csv(file, encoding=encoding, dtype=str, nrows=0)).columns
+    file.seek(0)
+    return list(header)
+
+def iter_csv_chunks(file, encoding, chunksize=STREAMING_CHUNK_ROWS):
+    file.seek(0)
+    for chunk in pd.read_csv(file, encoding=encoding, dtype=str, chunksize=chunksize):
+        yield normalize_columns(chunk.fillna(""))
+
+# ✅ 업로드 파일 내용 해시 (블록 단위로 읽어 메모리 사용 없음)
+def file_digest(file, block_size=ENCODING_SAMPLE_BYTES):
+    file.seek(0)
+    digest = hashlib.sha1()
+    for block in iter(lambda: file.read(block_size), b""):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+# ✅ 청크 단위 검증: 청크별 오류만 누적하므로 메모리는 청크 크기 + 오류 수에 비례
+#    progress(진행률 0~1, 누적 행 수) 콜백으로 진행 상황 전달
+#    incremental: begin_incremental_run() 결과를 넘기면 바뀐 행만 검증 (완료 후 finish_incremental_run 호출)
+# ✅ 인코딩 재판별: 앞부분(샘플)만 ASCII라 utf-8로 판별된 파일이 뒤에서 디코딩 실패하면 cp949로 처음부터 다시 검증
+#    반환: (오류, 행 수, 실제 사용한 인코딩)
+ENCODING_FALLBACKS = {"utf-8": "cp949", "utf-8-sig": "cp949"}
+
+def validate_csv_stream(file, encoding, meta, rules=None, standard=None, chunksize=STREAMING_CHUNK_ROWS, progress=None, workers=1, table_rules=None, incremental=None):
+    rules = rules if rules is not None else compile_meta_rules(meta)
+    while True:
+        try:
+            errors, rows = _validate_csv_stream(file, encoding, meta, rules, standard, chunksize, progress, workers, table_rules, incremental)
+            return errors, rows, encoding
+        except UnicodeDecodeError:
+            if encoding not in ENCODING_FALLBACKS:
+                raise
+            encoding = ENCODING_FALLBACKS[encoding]
+            _reset_stream_state(rules, table_rules, incremental)
+
+# 재시작 전 앞선 청크까지 누적된 상태(키 중복 맵, 증분 누적, 정규식 예산) 초기화
+def _reset_stream_state(rules, table_rules, incremental):
+    reset_match_budget(rules)
+    for rule in table_rules or ():
+        if "seen" in rule:
+            rule["seen"].clear()
+    if incremental is not None:
+        incremental.update(hashes=[], errors=[], reused=0, validated=0)
+
+def _validate_csv_stream(file, encoding, meta, rules, standard, chunksize, progress, workers, table_rules, incremental):
+    total_bytes = max(getattr(file, "size", 0) or 0, 1)
+    error_frames = []
+    rows = 0
+    chunks = iter_csv_chunks(file, encoding, chunksize)
+    if incremental is not None:
+        validated = iter_incremental_chunks(incremental, chunks, meta, rules, standard, workers, table_rules)
+    else:
+        validated = iter_validated_chunks(chunks, meta, rules, standard, workers, table_rules)
+    try:
+        for chunk_rows, errors in validated:
+            error_frames.append(errors)
+            rows += chunk_rows
+            if progress:
+                progress(min(file.tell() / total_bytes, 1.0), rows)
+    finally:
+        validated.close()       # 도중 실패 시 프로세스 풀 정리
+    return _concat_errors(error_frames), rows
+
+# ─────────────────────────────────────────────
+# ✅ 컬럼 프로파일 (빈값 비율, 고유값 수, 길이 범위, 값 형태 상위 목록)
+#    청크마다 컬럼별 벡터 연산 1회로 부분 집계 후 합산, 결과는 파일 해시별로 캐시
+#    고유값 수는 KMV 추정 (가장 작은 해시 K개만 유지 → 컬럼당 메모리 고정, K개 미만이면 정확값, 오차 약 1/√K)
+#    값 형태는 Misra-Gries 요약 (카운터 M개만 유지 → 건수는 과소추정, 오차 최대 행수/(M+1))
+# ─────────────────────────────────────────────
+COLUMN_PROFILE_TOP_SHAPES = 5
+COLUMN_PROFILE_SHAPE_COUNTERS = 64
+COLUMN_PROFILE_CACHE_SIZE = 16
+COLUMN_PROFILE_DISTINCT_SKETCH = 4096     # 오차 약 ±1.6%
+SHAPE_MAX_LENGTH = 40
+SHAPE_KEEP_SUFFIXES = "시군구읍면동리로길"
+
+_column_profile_cache = BoundedLRU(COLUMN_PROFILE_CACHE_SIZE)
+
+# ✅ 값 → 형태: 숫자 9, 영문 A/a, 한글 가 (단어 끝 행정구역·도로 접미사는 유지)
+#    예) 2024-01-05 → 9999-99-99, 충주시 교현동 → 가가시 가가동
+SHAPE_TABLE = str.maketrans({
+    **{chr(c): "9" for c in range(ord("0"), ord("9") + 1)},
+    **{chr(c): "A" for c in range(ord("A"), ord("Z") + 1)},
+    **{chr(c): "a" for c in range(ord("a"), ord("z") + 1)},
+    **{chr(c): "가" for c in range(ord("가"), ord("힣") + 1) if chr(c) not in SHAPE_KEEP_SUFFIXES},
+})
+
+def value_shapes(values):
+    shapes = (
+        values.str.slice(0, SHAPE_MAX_LENGTH)
+        .str.translate(SHAPE_TABLE)
+        .str.replace(rf"[{SHAPE_KEEP_SUFFIXES}](?=[가-힣])", "가", regex=True)
+    )
+    return shapes.where(values.str.len() <= SHAPE_MAX_LENGTH, shapes + "…")
+
+def _new_column_stats():
+    return {"rows": 0, "nulls": 0, "sketch": np.empty(0, dtype=np.uint64), "min": None, "max": None, "shapes": pd.Series(dtype="int64")}
+
+# ✅ 고유값 스케치 병합: 두 정렬 해시 배열의 합집합 중 가장 작은 K개
+def _merge_distinct_sketch(sketch, hashes, k=COLUMN_PROFILE_DISTINCT_SKETCH):
+    return np.union1d(sketch, np.unique(hashes)[:k])[:k]
+
+# ✅ 형태 요약 병합 (Misra-Gries): 합산 후 M개를 넘으면 (M+1)번째 건수만큼 모두 차감하고 0 이하는 버림
+def _merge_shape_counters(shapes, counts, m=COLUMN_PROFILE_SHAPE_COUNTERS):
+    merged = shapes.add(counts, fill_value=0).astype("int64")
+    if len(merged) <= m:
+        return merged
+    threshold = int(merged.nlargest(m + 1).iloc[-1])
+    merged = merged - threshold
+    return merged[merged > 0]
+
+def estimate_distinct(sketch, k=COLUMN_PROFILE_DISTINCT_SKETCH):
+    if len(sketch) < k:
+        return len(sketch)
+    return int(round((k - 1) * 2.0 ** 64 / (float(sketch[-1]) + 1)))
+
+# ✅ 청크 부분 집계: 컬럼을 factorize 1회 → 이후 계산은 고유값 기준(건수는 bincount 가중)
+def _profile_chunk(df, stats):
+    for col in df.columns:
+        codes, uniques = pd.factorize(_clean_values(df[col]))
+        counts = np.bincount(codes, minlength=len(uniques))
+        uniques = pd.Series(uniques, dtype=object)
+        filled = ~uniques.str.upper().isin(EMPTY_TOKENS).to_numpy()
+        stat = stats.setdefault(col, _new_column_stats())
+        stat["rows"] += len(codes)
+        stat["nulls"] += int(counts[~filled].sum())
+        present, counts = uniques[filled], counts[filled]
+        if present.empty:
+            continue
+        # 고유값은 값 대신 64비트 해시의 KMV 스케치로 누적 (청크 간 합집합, 크기 고정)
+        stat["sketch"] = _merge_distinct_sketch(stat["sketch"], pd.util.hash_array(present.to_numpy(dtype=object)))
+        lengths = present.str.len()
+        stat["min"] = int(lengths.min()) if stat["min"] is None else min(stat["min"], int(lengths.min()))
+        stat["max"] = int(lengths.max()) if stat["max"] is None else max(stat["max"], int(lengths.max()))
+        shape_counts = pd.Series(counts, index=value_shapes(present).to_numpy()).groupby(level=0).sum()
+        stat["shapes"] = _merge_shape_counters(stat["shapes"], shape_counts)
+
+def _format_shapes(shapes, present):
+    top = sorted(shapes.items(), key=lambda item: (-item[1], item[0]))[:COLUMN_PROFILE_TOP_SHAPES]
+    return " · ".join(f"{shape} ({count / present * 100:.1f}%)" for shape, count in top)
+
+def profile_chunks(chunks):
+    stats = {}
+    for chunk in chunks:
+        _profile_chunk(chunk, stats)
+    rows = []
+    for col, stat in stats.items():
+        present = stat["rows"] - stat["nulls"]
+        rows.append({
+            "컬럼": col,
+            "행수": stat["rows"],
+            "빈값수": stat["nulls"],
+            "빈값비율(%)": round(stat["nulls"] / stat["rows"] * 100, 1) if stat["rows"] else 0.0,
+            "고유값수(근사)": estimate_distinct(stat["sketch"]),
+            "최소길이": stat["min"],
+            "최대길이": stat["max"],
+            "상위형태": _format_shapes(stat["shapes"], present) if present else "",
+        })
+    return pd.DataFrame(rows, columns=["컬럼", "행수", "빈값수", "빈값비율(%)", "고유값수(근사)", "최소길이", "최대길이", "상위형태"])
+
+def profile_dataframe(df):
+    return profile_chunks([df])
+
+# ✅ 파일 해시별 프로파일 캐시 (chunks는 캐시 미스일 때만 소비)
+def get_column_profile(digest, chunks):
+    profile = _column_profile_cache.get(digest)
+    if profile is None:
+        profile = _column_profile_cache.put(digest, profile_chunks(chunks))
+    return profile
+
+# ✅ 셀 단위 검증 (기존 방식, 결과 비교용 기준 경로)
+def run_cell_validation(df, meta, standard=None):
     error_cells = []
     for i, row in df.iterrows():
         for col in df.columns:
             val = row[col]
             row_data = row.to_dict()
-            errs = validate_cell(val, col, meta, row_data)
+            errs = validate_cell(val, col, meta, row_data, standard)
             if errs:
                 error_cells.append((i+2, col, ", ".join(errs)))
     return error_cells
 
-# ✅ 오류 셀 표시된 엑셀 생성
+# ─────────────────────────────────────────────
+# ✅ 오류 셀 표시된 엑셀 생성 (xlsxwriter constant_memory 단일 패스)
+#    행을 순서대로 내보내면서 오류 셀에만 노란 서식을 적용 → 재로딩/재저장 없음
+# ─────────────────────────────────────────────
+EXCEL_MAX_ROWS = 1_048_576
+
+def write_excel_with_errors(output, columns, chunks, error_cells):
+    col_idx = {col: i for i, col in enumerate(columns)}
+    marks = {}
+    for row, col, _ in error_cells:
+        if col in col_idx:
+            marks.setdefault(row - 1, set()).add(col_idx[col])  # 엑셀 행번호 → 0 기반
+
+    # 값은 원문 그대로 기록 (URL/수식/숫자 자동 변환 끔 → URL 65,530개 제한·'=' 수식 해석 방지)
+    wb = xlsxwriter.Workbook(output, {
+        "constant_memory": True, "strings_to_urls": False, "strings_to_formulas": False, "strings_to_numbers": False,
+    })
+    ws = wb.add_worksheet()
+    header_fmt = wb.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    yellow = wb.add_format({"bg_color": "#FFFF00", "pattern": 1})
+
+    ws.write_row(0, 0, list(columns), header_fmt)
+    row_no = 1
+    for chunk in chunks:
+        for values in chunk.to_numpy(dtype=object):
+            marked = marks.get(row_no)
+            if marked:
+                for c, value in enumerate(values):
+                    ws.write(row_no, c, value, yellow if c in marked else None)
+            else:
+                ws.write_row(row_no, 0, values)
+            row_no += 1
+    wb.close()
+    return output
+
 def generate_excel_with_errors(df, error_cells):
     output = BytesIO()
-    df.to_excel(output, index=False)
+    write_excel_with_errors(output, df.columns, [df], error_cells)
     output.seek(0)
-    wb = load_workbook(output)
-    ws = wb.active
-    yellow = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-    col_idx = {col: i+1 for i, col in enumerate(df.columns)}
-    for row, col, _ in error_cells:
-        ws.cell(row=row, column=col_idx[col]).fill = yellow
-    final_output = BytesIO()
-    wb.save(final_output)
-    final_output.seek(0)
-    return final_output
+    return output
+
+# ✅ 다운로드 요청 시에만 생성 (결과 캐시에는 오류 목록만 보관 → 캐시 메모리가 파일 크기에 비례하지 않음)
+#    대용량(스트리밍 기준 이상) 파일이나 엑셀 최대 행 수를 넘는 파일은 오류 리포트만 제공
+def excel_export_allowed(file_size, total_rows):
+    return file_size < STREAMING_THRESHOLD_BYTES and total_rows < EXCEL_MAX_ROWS
+
+def build_error_workbook(df, file, encoding, header, errors):
+    if df is not None:
+        return generate_excel_with_errors(df, errors_to_cells(errors)).getvalue()
+    output = BytesIO()
+    write_excel_with_errors(output, header, iter_csv_chunks(file, encoding), errors_to_cells(errors))
+    return output.getvalue()
+
+# ✅ 압축 오류 리포트 (행, 컬럼, 오류) — 대용량 파일은 엑셀 대신 사용
+#    Parquet은 pyarrow(requirements.txt) 또는 fastparquet이 있을 때만 선택지로 보여줌
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+def parquet_available():
+    return any(importlib.util.find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+def export_error_report(errors, fmt="CSV"):
+    output = BytesIO()
+    if fmt == "Parquet":
+        errors.to_parquet(output, index=False)
+    else:
+        output.write(errors.to_csv(index=False).encode("utf-8-sig"))
+    return output.getvalue()
+
+def error_report_download(errors, key, cache=None):
+    formats = ["CSV", "Parquet"] if parquet_available() else ["CSV"]
+    fmt = st.radio("오류 리포트 형식", formats, horizontal=True, key=f"report_fmt_{key}")
+    cache = cache if cache is not None else {}
+    try:
+        if fmt not in cache:
+            cache[fmt] = export_error_report(errors, fmt)
+        data = cache[fmt]
+    except ImportError as e:
+        st.warning(f"⚠️ Parquet 저장에 필요한 패키지가 없습니다: {e}")
+        return
+    st.download_button(
+        label=f"📥 오류 리포트 다운로드 ({fmt})",
+        data=data,
+        file_name=f"검증결과_오류목록.{fmt.lower()}",
+        mime="text/csv" if fmt == "CSV" else "application/octet-stream",
+        key=f"report_download_{key}",
+    )
+
+# ─────────────────────────────────────────────
+# ✅ 전체 검증 실행 (UI 출력 없음 → 백그라운드 스레드에서도 호출 가능)
+#    df가 있으면 메모리 검증, 없으면 file 스트리밍 검증. 결과 dict는 세션에 그대로 보관
+# ─────────────────────────────────────────────
+def run_full_validation(df, file, encoding, header, meta, rules, standard, table_rules=None, workers=1, incremental=False, progress=None):
+    reset_match_budget(rules)
+    run = begin_incremental_run(standard, header, meta, rules) if incremental else None
+    if df is None:
+        errors, total_rows, encoding = validate_csv_stream(
+            file, encoding, meta, rules, standard,
+            progress=progress, workers=workers, table_rules=table_rules, incremental=run,
+        )
+    else:
+        if run is not None:
+            errors = validate_chunk_incremental(run, df, meta, rules, standard, table_rules=table_rules, workers=workers)
+        else:
+            errors = validate_dataframe_parallel(df, meta, rules, standard, workers, table_rules=table_rules)
+        total_rows = len(df)
+    return {
+        "errors": errors,
+        "total_rows": total_rows,
+        "encoding": encoding,
+        "incremental": finish_incremental_run(run) if run is not None else None,
+        "skipped": skipped_cells(rules),
+    }
+
+# ─────────────────────────────────────────────
+# ✅ 검증 결과 메모 (업로드 파일 해시, 표준, 카탈로그 버전, 규칙 지문, 행 간 검사 옵션) → 결과 dict
+#    재실행·다운로드·페이지 이동 시 검증을 다시 하지 않음 (요약·오류 목록만 보관). 같은 파일이면 세션 간에도 공유
+#    GPT 정규식 생성이 실패한 실행의 결과는 세션 안에서만 보관 (복구 후 다른 세션이 실패 결과를 받지 않도록)
+# ─────────────────────────────────────────────
+RESULT_CACHE_SIZE = 8
+
+_result_cache = BoundedLRU(RESULT_CACHE_SIZE)
+
+def validation_cache_key(digest, standard, rules_digest, key_columns=(), check_regions=False, check_coordinates=False):
+    return (
+        digest, standard, get_meta_catalog()["version"], rules_digest,
+        tuple(key_columns or ()), bool(check_regions), bool(check_coordinates),
+    )
+
+def get_cached_result(key):
+    return _result_cache.get(key)
+
+def put_cached_result(key, result):
+    return _result_cache.put(key, result)
+
+def get_session_result(key):
+    local = st.session_state.get("validator_result")
+    if local and local["key"] == key:
+        return local["result"]
+    return get_cached_result(key)
+
+def put_session_result(key, result, shared=True):
+    if shared:
+        st.session_state.pop("validator_result", None)
+        return put_cached_result(key, result)
+    st.session_state["validator_result"] = {"key": key, "result": result}
+    return result
+
+# ─────────────────────────────────────────────
+# ✅ 빠른 검증 (층화 표본 1~5% 즉시 검증 → 컬럼별 예상 오류율 + 95% 신뢰구간)
+#    행 순서를 구간(층)으로 나눠 구간마다 같은 비율로 추출 → 지역·기간별로 정렬된 파일도 고르게 표본화
+#    행 간 규칙(키 중복 등)은 표본으로 추정할 수 없어 컬럼 규칙만 적용
+# ─────────────────────────────────────────────
+QUICK_SAMPLE_FRACTION = 0.02
+QUICK_MIN_SAMPLE_ROWS = 1_000
+QUICK_STRATA = 50
+CONFIDENCE_Z = 1.96
+
+_background_pool = ThreadPoolExecutor(max_workers=2)
+
+# ✅ 파일 전체 행 수 기준 표본 비율 (최소 표본 행 수 보장, 1회만 계산해 모든 층에 같은 비율 적용)
+def quick_sample_fraction(rows, fraction=QUICK_SAMPLE_FRACTION):
+    return min(max(fraction, QUICK_MIN_SAMPLE_ROWS / rows), 1.0) if rows else 1.0
+
+# ✅ 층별 추출 건수는 확률적 반올림 → 작은 층도 기대 비율이 정확히 fraction (가중치 없이 추정 가능)
+def stratified_sample(df, fraction, seed=0, strata=QUICK_STRATA):
+    rows = len(df)
+    if rows == 0:
+        return df
+    rng = np.random.default_rng(seed)
+    picks = []
+    for block in np.array_split(np.arange(rows), min(strata, rows)):
+        size = min(int(len(block) * fraction + rng.random()), len(block))
+        picks.append(np.sort(rng.choice(block, size=size, replace=False)))
+    return df.iloc[np.concatenate(picks)]
+
+# ✅ 행 수 추정: 블록 단위로 줄바꿈만 셈 (따옴표 안 줄바꿈만큼 많게 잡혀도 비율이 조금 작아질 뿐)
+def count_csv_rows(file, block_size=ENCODING_SAMPLE_BYTES):
+    file.seek(0)
+    newlines, last = 0, b"\n"
+    for block in iter(lambda: file.read(block_size), b""):
+        newlines += block.count(b"\n")
+        last = block[-1:]
+    file.seek(0)
+    return max(newlines - 1 + (last != b"\n"), 0)
+
+# ✅ 스트리밍 파일은 청크를 층으로 보고 파일 전체 기준 비율 1개로 모든 청크에서 추출 (검증 없이 읽기만 1회)
+#    뒤에서 디코딩이 실패하면 전체 검증과 같은 대체 인코딩으로 처음부터 다시 추출
+def sample_csv_stream(file, encoding, fraction=QUICK_SAMPLE_FRACTION, seed=0, chunksize=STREAMING_CHUNK_ROWS):
+    fraction = quick_sample_fraction(count_csv_rows(file), fraction)
+    while True:
+        samples, total_rows = [], 0
+        try:
+            for i, chunk in enumerate(iter_csv_chunks(file, encoding, chunksize)):
+                total_rows += len(chunk)
+                samples.append(stratified_sample(chunk, fraction, seed + i, strata=max(1, QUICK_STRATA * len(chunk) // chunksize)))
+            return (pd.concat(samples) if samples else pd.DataFrame()), total_rows
+        except UnicodeDecodeError:
+            if encoding not in ENCODING_FALLBACKS:
+                raise
+            encoding = ENCODING_FALLBACKS[encoding]
+
+# ✅ Wilson 점수 구간 (+ 유한모집단 보정)
+def wilson_interval(errors, n, population=None, z=CONFIDENCE_Z):
+    errors, n = np.asarray(errors, dtype=float), float(n)
+    p = errors / n
+    denom = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    if population and population > 1:
+        half = half * np.sqrt(max(population - n, 0) / (population - 1))
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+# ✅ 표본 오류 → 컬럼별 예상 오류율/건수 (오류가 나온 컬럼 + 행 기준 전체)
+def project_error_rates(sample_errors, sample_rows, total_rows):
+    if sample_rows == 0:
+        return pd.DataFrame()
+    counts = sample_errors.groupby("컬럼", sort=False)["행"].nunique()
+    counts = pd.concat([pd.Series({"전체(오류 있는 행)": sample_errors["행"].nunique()}), counts.sort_values(ascending=False)])
+    low, high = wilson_interval(counts.to_numpy(), sample_rows, total_rows)
+    rate = counts.to_numpy() / sample_rows
+    return pd.DataFrame({
+        "컬럼": counts.index,
+        "표본오류수": counts.to_numpy(),
+        "예상오류율(%)": np.round(rate * 100, 2),
+        "95%하한(%)": np.round(low * 100, 2),
+        "95%상한(%)": np.round(high * 100, 2),
+        "예상오류건수": np.round(rate * total_rows).astype(int),
+    })
+
+# ✅ 백그라운드 전체 검증용 업로드 사본: 임시 파일로 블록 단위 복사 (메모리에 두 벌 두지 않음), 검증 후 삭제
+def spool_upload(uploaded_file, block_size=ENCODING_SAMPLE_BYTES):
+    spool = tempfile.TemporaryFile()
+    uploaded_file.seek(0)
+    shutil.copyfileobj(uploaded_file, spool, block_size)
+    uploaded_file.seek(0)
+    spool.seek(0)
+    return spool
+
+def run_spooled_validation(spool, *args, **kwargs):
+    with spool:
+        return run_full_validation(None, spool, *args, **kwargs)
+
+def run_quick_validation(sample, total_rows, meta, rules, standard=None):
+    sample_errors = validate_dataframe(sample, meta, rules, standard)
+    return {"projection": project_error_rates(sample_errors, len(sample), total_rows), "sample_rows": len(sample), "total_rows": total_rows}
+
+# ✅ 백그라운드 전체 검증 완료 여부를 주기적으로 확인 → 완료되면 결과를 세션에 옮기고 전체 새로고침
+@st.fragment(run_every=2)
+def poll_background_validation(job_key, result_key):
+    job = st.session_state.get(job_key)
+    if not job:
+        return
+    future = job["future"]
+    if not future.done():
+        st.info(f"⏳ 전체 검증 진행 중... ({time.time() - job['started']:.0f}초 경과) 완료되면 예상치가 실제 결과로 바뀝니다.")
+        return
+    st.session_state.pop(job_key)
+    try:
+        put_session_result(result_key, future.result(), job["shared"])
+    except Exception as e:
+        st.session_state["validator_error"] = f"❌ 전체 검증 실패: {e}"
+    st.rerun()
+
+# ─────────────────────────────────────────────
+# ✅ 검증 결과 보기 (요약표 + 오류 행 페이지 단위 렌더링 + 행 번호 이동)
+# ─────────────────────────────────────────────
+RESULT_PAGE_SIZE = 100
+UPLOAD_PREVIEW_ROWS = 100         # 업로드 미리보기는 앞부분만 렌더링 (전체 렌더링 시 브라우저 멈춤)
+
+# ✅ 컬럼 × 오류유형 건수 요약 (합계 포함, 합계 많은 컬럼 순)
+def summarize_errors(errors):
+    if errors.empty:
+        return pd.DataFrame()
+    summary = pd.crosstab(errors["컬럼"], errors["오류"], margins=True, margins_name="합계")
+    total = summary.loc["합계"]
+    summary = summary.drop(index="합계").sort_values("합계", ascending=False)
+    return pd.concat([summary, total.to_frame().T])
+
+def error_rows_of(errors):
+    return errors["행"].drop_duplicates().to_numpy()  # 오류 목록은 행 순으로 정렬되어 있음
+
+def page_count_of(error_rows, page_size=RESULT_PAGE_SIZE):
+    return max((len(error_rows) + page_size - 1) // page_size, 1)
+
+# ✅ 행 번호 → 해당 행(또는 그 다음 오류 행)이 있는 페이지 (1부터)
+def find_error_page(error_rows, row, page_size=RESULT_PAGE_SIZE):
+    pos = int(np.searchsorted(error_rows, row))
+    return min(pos // page_size, page_count_of(error_rows, page_size) - 1) + 1
+
+# ✅ 현재 페이지 행만 원본에서 꺼내 오류 메시지를 덧붙임 (원본이 없으면 오류 목록만)
+def build_result_page(errors, error_rows, page, df=None, page_size=RESULT_PAGE_SIZE):
+    rows = error_rows[(page - 1) * page_size: page * page_size]
+    # 오류 목록은 행 순 정렬 → 페이지 구간만 이진 탐색으로 잘라냄
+    row_values = errors["행"].to_numpy()
+    start = np.searchsorted(row_values, rows[0], side="left") if len(rows) else 0
+    end = np.searchsorted(row_values, rows[-1], side="right") if len(rows) else 0
+    page_errors = errors.iloc[start:end]
+    if df is None:
+        return page_errors.reset_index(drop=True)
+
+    preview = df.iloc[rows - 2].copy()
+    preview.index = rows
+    preview.index.name = "행"
+    for row, col, msg in page_errors.itertuples(index=False):
+        preview.at[row, col] = f"{preview.at[row, col]} ⚠️ ({msg})"
+    return preview
+
+# ✅ cache: 결과별 dict를 넘기면 요약표·오류 행 목록을 1회만 계산 (페이지 이동 재실행 시 재사용)
+# ✅ skipped: {컬럼: 셀 수} 시간 예산 초과로 형식 검사를 생략한 셀 (생략 셀은 오류로 집계되지 않음)
+def render_validation_results(errors, df=None, total_rows=None, key="validator", cache=None, skipped=None):
+    st.subheader("📋 검증 결과")
+    if skipped:
+        st.warning(
+            f"⏱️ 위험 정규식(재작성) 실행 시간 예산({COLUMN_MATCH_BUDGET_SEC:g}초) 초과로 {sum(skipped.values()):,}개 셀의 형식 검사를 생략했습니다: "
+            + ", ".join(f"{col}({count:,})" for col, count in skipped.items())
+        )
+    if errors.empty:
+        if skipped:
+            st.info(f"ℹ️ 검사한 셀에서는 오류가 없습니다. ({total_rows or 0:,}행, 형식 검사 생략 셀 제외)")
+        else:
+            st.success(f"🎉 오류가 없습니다. ({total_rows or 0:,}행 검증)")
+        return
+
+    cache = cache if cache is not None else {}
+    if "error_rows" not in cache:
+        cache["error_rows"] = error_rows_of(errors)
+        cache["summary"] = summarize_errors(errors)
+    error_rows = cache["error_rows"]
+    page_count = page_count_of(error_rows)
+    page_key = f"{key}_page"
+    jump_key = f"{key}_jump"
+    st.write(f"총 {total_rows or 0:,}행 중 오류 행 {len(error_rows):,}건 / 오류 셀 {len(errors):,}건")
+
+    st.markdown("#### 📊 컬럼·오류유형별 요약")
+    st.dataframe(cache["summary"], use_container_width=True)
+
+    def jump_to_row():
+        target = st.session_state.get(jump_key)
+        if target is not None:
+            st.session_state[page_key] = find_error_page(error_rows, int(target))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.number_input("🔎 행 번호로 이동", min_value=2, step=1, value=None, key=jump_key, on_change=jump_to_row)
+    with col2:
+        if st.session_state.get(page_key, 1) > page_count:
+            st.session_state[page_key] = 1
+        page = st.number_input(f"페이지 (1~{page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+
+    target = st.session_state.get(jump_key)
+    if target is not None:
+        row_errors = errors[errors["행"] == int(target)]
+        if row_errors.empty:
+            st.info(f"ℹ️ {int(target)}행에는 오류가 없습니다.")
+        else:
+            st.write(f"📌 {int(target)}행 오류: " + ", ".join(f"{c}({m})" for c, m in zip(row_errors["컬럼"], row_errors["오류"])))
+
+    st.dataframe(build_result_page(errors, error_rows, int(page), df), use_container_width=True)
+
+# ✅ 업로드 파일 해시 (같은 업로드는 세션에서 1회만 계산)
+def uploaded_file_digest(uploaded_file):
+    digests = st.session_state.setdefault("file_digests", {})
+    key = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    if key not in digests:
+        digests[key] = file_digest(uploaded_file)
+    return digests[key]
+
+# ✅ 관리자 보기: 거부/재작성/예산 적용 정규식, 시간 예산을 넘긴 규칙
+def render_regex_admin():
+    with st.expander("🛠️ 관리자: 위험·지연 정규식"):
+        profiles = pattern_profile_report()
+        slow = slow_rule_report()
+        if profiles.empty and slow.empty:
+            st.caption("감지된 위험/지연 정규식이 없습니다.")
+        if not profiles.empty:
+            st.markdown("**컴파일 시 프로파일링 결과 (재작성/예산/거부)**")
+            st.dataframe(profiles, hide_index=True)
+        if not slow.empty:
+            st.markdown("**실행 시간 예산 초과 (일부 셀 검사 생략)**")
+            st.dataframe(slow, hide_index=True)
 
 # ✅ Streamlit 앱 실행
 def data_validator_app():
@@ -157,44 +1969,189 @@ def data_validator_app():
         st.error("❌ meta_dicts_final_clean 폴더가 존재하지 않습니다.")
         st.stop()
 
-    meta_files = [f.replace(".json", "") for f in os.listdir(META_DIR) if f.endswith(".json")]
-    meta_files_sorted = sorted(meta_files, key=locale.strxfrm)
+    df = None
+    header = None
+    streaming = False
+    if uploaded_file:
+        streaming = st.checkbox(
+            "⚡ 대용량 스트리밍 검증 (전체 미리보기 생략, 청크 단위 검증)",
+            value=uploaded_file.size >= STREAMING_THRESHOLD_BYTES,
+        )
+        workers = st.number_input(
+            "🧮 병렬 프로세스 수 (대용량 파일은 코어 수만큼 늘리면 빨라집니다)",
+            min_value=1, max_value=os.cpu_count() or 1, value=1, step=1,
+        )
+        try:
+            encoding = detect_file_encoding(uploaded_file)
+            if streaming:
+                header = read_csv_header(uploaded_file, encoding)
+            else:
+                df = normalize_columns(pd.read_csv(uploaded_file, encoding=encoding, dtype=str).fillna(""))
+                header = list(df.columns)
+        except Exception as e:
+            st.error(f"❌ 파일 처리 오류: {e}")
+            return
 
-    standard = st.selectbox("검증 기준 표준을 선택하세요", options=meta_files_sorted)
+        # ✅ 규칙 작성 전 컬럼 현황 확인 (파일 해시별 캐시 → 재실행 시 재계산 없음)
+        if st.checkbox("📊 컬럼 프로파일 보기 (빈값 비율·고유값 수·길이·값 형태)"):
+            digest = uploaded_file_digest(uploaded_file)
+            chunks = [df] if df is not None else iter_csv_chunks(uploaded_file, encoding)
+            with st.spinner("📊 컬럼 프로파일 계산 중..."):
+                st.dataframe(get_column_profile(digest, chunks), hide_index=True)
 
-    if uploaded_file and standard:
-        try:
-            raw_bytes = uploaded_file.read()
-            encoding = chardet.detect(raw_bytes)['encoding'] or 'utf-8'
-            df = pd.read_csv(BytesIO(raw_bytes), encoding=encoding, dtype=str).fillna("")
+    # ✅ 업로드 헤더 기반 표준 추천 → 최상위 표준이 최소 점수 이상일 때만 기본 선택 (미달이면 선택 안 함)
+    standards = list_standards()
+    default_index = 0
+    if header is not None:
+        suggestions = suggest_standards(header)
+        default_index = None
+        if suggestions:
+            st.markdown("#### 🧭 헤더 기반 추천 표준")
+            st.dataframe(pd.DataFrame(suggestions).drop(columns="점수"), hide_index=True)
+            if suggestions[0]["점수"] >= SUGGEST_MIN_SCORE:
+                default_index = standards.index(suggestions[0]["표준"])
+            else:
+                st.info("ℹ️ 추천 표준의 일치도가 낮아 자동 선택하지 않았습니다. 직접 선택해주세요.")
+        else:
+            st.info("ℹ️ 헤더와 일치하는 표준을 찾지 못했습니다. 직접 선택해주세요.")
 
-            df.columns = [col.strip().replace(" ", "") for col in df.columns]
+    standard = st.selectbox("검증 기준 표준을 선택하세요", options=standards, index=default_index)
+    render_regex_admin()
 
+    if header is not None and standard:
+        try:
             st.success(f"✅ 파일 업로드 성공 (인코딩: {encoding})")
-            st.dataframe(df)
+            if df is not None:
+                st.caption(f"👀 미리보기: 앞 {min(len(df), UPLOAD_PREVIEW_ROWS):,}행 / 전체 {len(df):,}행")
+                st.dataframe(df.head(UPLOAD_PREVIEW_ROWS))
 
             meta = load_meta_dict(standard)
             if not meta:
                 st.error("❌ 메타 정보를 불러올 수 없습니다.")
                 return
 
-            if st.button("🔍 정밀 검증 실행"):
-                error_cells = run_meta_validation(df, meta)
-                st.subheader("📋 검증 결과 미리보기")
+            with st.spinner("🤖 설명 기반 정규식 준비 중..."):
+                prefetch = prefetch_generated_regexes(standard, meta, columns=set(header))
+            for col, err in prefetch["실패"].items():
+                st.warning(f"❗ 정규식 생성 실패 ({col}): {err}")
+
+            # ✅ 행 간 검사 옵션 (키 중복 / 시도·시군구 참조)
+            col1, col2 = st.columns(2)
+            with col1:
+                key_columns = st.multiselect("🔑 중복 검사 키 컬럼", options=header, default=detect_key_columns(header, meta, standard))
+            with col2:
+                check_regions = st.checkbox(
+                    "🗺️ 시도/시군구 참조 검사", value=False,
+                    help="시도명(약칭 포함)과, 시군구명 앞 시도·참조 목록으로 특정되는 시도가 시도 컬럼과 맞는지 검사합니다.",
+                )
+                if check_regions and not region_membership_check_enabled():
+                    st.info("ℹ️ 시군구 참조 목록이 일부만 수록되어 있어 시군구명 소속(목록에 없는 이름) 검사는 꺼져 있습니다.")
+                coordinate_pairs = detect_coordinate_columns(header, meta)
+                check_coordinates = st.checkbox(
+                    "📍 위도/경도 범위 검사 (국외·뒤바뀜·신고 지역 밖)",
+                    value=bool(coordinate_pairs), disabled=not coordinate_pairs,
+                )
+                incremental = st.checkbox("♻️ 변경된 행만 재검증 (이전 검증 결과 재사용)", value=True)
+
+            # 규칙 지문을 키에 포함 → GPT 복구·정규식 캐시 무효화 후에는 새 결과로 다시 검증
+            rules = get_standard_rules(standard, meta)
+            shared = not prefetch["실패"]
+            result_key = validation_cache_key(
+                uploaded_file_digest(uploaded_file), standard, rules_fingerprint(standard, header, rules),
+                key_columns, check_regions, check_coordinates,
+            )
+            result = get_session_result(result_key)
+            quick_fraction = st.slider(
+                "⚡ 빠른 검증 표본 비율 (%)", min_value=1, max_value=5, value=int(QUICK_SAMPLE_FRACTION * 100)
+            ) / 100
+            col1, col2 = st.columns(2)
+            with col1:
+                full_clicked = st.button("🔍 정밀 검증 실행")
+            with col2:
+                quick_clicked = st.button("⚡ 빠른 검증 (표본 → 전체는 백그라운드)")
+
+            # 같은 파일·표준·옵션의 결과가 이미 있으면 버튼을 눌러도 다시 검증하지 않음
+            job = st.session_state.get("validator_job")
+            job_running = bool(job and job["key"] == result_key and not job["future"].done())
+            full_clicked = full_clicked and result is None and not job_running
+            quick_clicked = quick_clicked and result is None and not job_running
+            if full_clicked or quick_clicked:
+                table_rules = compile_table_rules(header, key_columns, check_regions, check_coordinates, meta)
+                st.session_state.pop("validator_error", None)
+
+            if full_clicked:
+                st.session_state.pop("validator_job", None)
+                bar = st.progress(0.0, text="검증 중...") if streaming else None
+                result = run_full_validation(
+                    df, uploaded_file, encoding, header, meta, rules, standard, table_rules, int(workers), incremental,
+                    progress=(lambda done, rows: bar.progress(done, text=f"검증 중... {rows:,}행")) if bar else None,
+                )
+                if bar:
+                    bar.progress(1.0, text=f"✅ {result['total_rows']:,}행 검증 완료")
+                put_session_result(result_key, result, shared)
+
+            if quick_clicked:
+                with st.spinner("⚡ 표본 추출·검증 중..."):
+                    if streaming:
+                        sample, total_rows = sample_csv_stream(uploaded_file, encoding, quick_fraction)
+                    else:
+                        sample, total_rows = stratified_sample(df, quick_sample_fraction(len(df), quick_fraction)), len(df)
+                    quick = run_quick_validation(sample, total_rows, meta, rules, standard)
+                # 스트리밍 전체 검증은 임시 파일 사본으로 백그라운드 실행 (화면 재실행 중 파일 위치가 바뀌지 않도록)
+                args = (encoding, header, meta, rules, standard, table_rules, int(workers), incremental)
+                future = (
+                    _background_pool.submit(run_full_validation, df, None, *args) if df is not None
+                    else _background_pool.submit(run_spooled_validation, spool_upload(uploaded_file), *args)
+                )
+                st.session_state["validator_quick"] = {"key": result_key, **quick}
+                st.session_state["validator_job"] = {
+                    "key": result_key,
+                    "shared": shared,
+                    "started": time.time(),
+                    "future": future,
+                }
 
-                preview_df = df.copy()
-                for row, col, msg in error_cells:
-                    preview_df.at[row - 2, col] += f" ⚠️ ({msg})"
+            if st.session_state.get("validator_error"):
+                st.error(st.session_state["validator_error"])
 
-                st.dataframe(preview_df, use_container_width=True)
+            # ✅ 전체 결과가 나오기 전까지는 표본 기반 예상치 표시
+            quick = st.session_state.get("validator_quick")
+            job = st.session_state.get("validator_job")
+            if result is None and quick and quick["key"] == result_key:
+                st.markdown(f"#### ⚡ 표본 기반 예상 오류율 (표본 {quick['sample_rows']:,}행 / 전체 {quick['total_rows']:,}행)")
+                if len(quick["projection"]) and quick["projection"]["표본오류수"].iloc[0]:
+                    st.dataframe(quick["projection"], hide_index=True)
+                else:
+                    st.success("✅ 표본에서 오류가 발견되지 않았습니다.")
+                st.caption("ℹ️ 95% 신뢰구간(Wilson). 키 중복·시도/시군구 참조 검사는 전체 검증 결과에만 반영됩니다.")
+                if job and job["key"] == result_key:
+                    poll_background_validation("validator_job", result_key)
 
-                excel_with_errors = generate_excel_with_errors(df, error_cells)
-                st.download_button(
-                    label="📥 오류 표시된 엑셀 다운로드",
-                    data=excel_with_errors.getvalue(),
-                    file_name="검증결과_정밀표시.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            # ✅ 검증 결과는 (파일 해시, 표준, 카탈로그 버전, 옵션)으로 메모 → 다른 위젯을 바꿔도 유지
+            if result is not None:
+                if result.get("incremental"):
+                    stats = result["incremental"]
+                    st.caption(f"♻️ 이전 결과 재사용 {stats['재사용행']:,}행 · 새로 검증 {stats['검증행']:,}행")
+                render_validation_results(
+                    result["errors"], df, result["total_rows"], cache=result.setdefault("view", {}), skipped=result.get("skipped")
                 )
+                # 엑셀은 버튼을 누를 때만 만들고 이 세션에 1개만 보관 (공유 결과 캐시에는 넣지 않음)
+                if excel_export_allowed(uploaded_file.size, result["total_rows"]):
+                    excel = st.session_state.get("validator_excel")
+                    if not (excel and excel["key"] == result_key) and st.button("📊 오류 표시된 엑셀 만들기"):
+                        with st.spinner("📊 엑셀 생성 중..."):
+                            data = build_error_workbook(df, uploaded_file, result.get("encoding", encoding), header, result["errors"])
+                        excel = st.session_state["validator_excel"] = {"key": result_key, "data": data}
+                    if excel and excel["key"] == result_key:
+                        st.download_button(
+                            label="📥 오류 표시된 엑셀 다운로드",
+                            data=excel["data"],
+                            file_name="검증결과_정밀표시.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
+                else:
+                    st.info("ℹ️ 대용량 파일(또는 엑셀 최대 행 수 초과)은 엑셀 대신 오류 리포트만 제공합니다.")
+                error_report_download(result["errors"], "result", cache=result.setdefault("reports", {}))
         except Exception as e:
             st.error(f"❌ 파일 처리 오류: {e}")
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# geocode_cache.py
+# ✅ 카카오 지오코딩 결과를 디스크(SQLite)에 보관하여 세션/사용자 간 공유
+#    주소 → 좌표: 정규화 주소 키 → (위도, 경도, 정확도 라벨)
+#    좌표 → 주소: 소수 5자리(약 1m)로 반올림한 좌표 키 → (지번주소, 도로명주소)
+#    TTL이 지난 항목은 없는 것으로 취급 (주소 체계 변경 반영)
+
+import os
+import time
+import sqlite3
+import threading
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "cache", "geocode_cache.sqlite3")
+CACHE_TTL_SEC = 90 * 24 * 3600
+COORD_DECIMALS = 5            # 위도 0.00001° ≈ 1.1m
+
+_lock = threading.Lock()
+_stats = {"forward": {"hit": 0, "miss": 0}, "reverse": {"hit": 0, "miss": 0}}
+
+def _connect(path=None):
+    path = path or CACHE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS forward_cache (
+            address    TEXT PRIMARY KEY,
+            lat        TEXT,
+            lon        TEXT,
+            accuracy   TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS reverse_cache (
+            coord      TEXT PRIMARY KEY,
+            jibun      TEXT,
+            road       TEXT,
+            error      TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """)
+    return conn
+
+def _query(sql, params=(), path=None, write=False):
+    with _lock:
+        conn = _connect(path)
+        try:
+            if write:
+                with conn:
+                    return conn.execute(sql, params).rowcount
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+def _count(kind, hit):
+    with _lock:
+        _stats[kind]["hit" if hit else "miss"] += 1
+
+def coord_key(lat, lon):
+    return f"{round(float(lat), COORD_DECIMALS):.{COORD_DECIMALS}f},{round(float(lon), COORD_DECIMALS):.{COORD_DECIMALS}f}"
+
+# ✅ 주소 → 좌표 캐시 조회 (없거나 만료되면 None)
+def get_forward(address_key, ttl=CACHE_TTL_SEC, path=None):
+    rows = _query(
+        "SELECT lat, lon, accuracy FROM forward_cache WHERE address=? AND created_at>=?",
+        (address_key, time.time() - ttl), path,
+    )
+    _count("forward", bool(rows))
+    if not rows:
+        return None
+    lat, lon, accuracy = rows[0]
+    return {"위도": lat, "경도": lon, "정확도": accuracy, "오류": ""}
+
+def put_forward(address_key, result, path=None):
+    _query(
+        "INSERT OR REPLACE INTO forward_cache VALUES (?, ?, ?, ?, ?)",
+        (address_key, result["위도"], result["경도"], result["정확도"], time.time()), path, write=True,
+    )
+
+# ✅ 좌표 → 주소 캐시 조회 (좌표는 약 1m 단위로 묶음)
+def get_reverse(lat, lon, ttl=CACHE_TTL_SEC, path=None):
+    try:
+        key = coord_key(lat, lon)
+    except (TypeError, ValueError):
+        return None
+    rows = _query(
+        "SELECT jibun, road, error FROM reverse_cache WHERE coord=? AND created_at>=?",
+        (key, time.time() - ttl), path,
+    )
+    _count("reverse", bool(rows))
+    if not rows:
+        return None
+    jibun, road, error = rows[0]
+    return {"지번주소": jibun, "도로명주소": road, "오류": error}
+
+def put_reverse(lat, lon, result, path=None):
+    _query(
+        "INSERT OR REPLACE INTO reverse_cache VALUES (?, ?, ?, ?, ?)",
+        (coord_key(lat, lon), result.get("지번주소"), result.get("도로명주소"), result.get("오류") or "", time.time()),
+        path, write=True,
+    )
+
+# ✅ 적중률 카운터 (프로세스 기동 후 누적, 모든 세션 공유)
+def cache_stats():
+    with _lock:
+        stats = {kind: dict(counts) for kind, counts in _stats.items()}
+    for counts in stats.values():
+        total = counts["hit"] + counts["miss"]
+        counts["rate"] = counts["hit"] / total if total else None
+    return stats
+
+def entry_counts(path=None):
+    forward = _query("SELECT COUNT(*) FROM forward_cache", path=path)[0][0]
+    reverse = _query("SELECT COUNT(*) FROM reverse_cache", path=path)[0][0]
+    return {"forward": forward, "reverse": reverse}
+
+# ✅ 만료 항목 삭제 → 삭제 건수
+def purge_expired(ttl=CACHE_TTL_SEC, path=None):
+    cutoff = time.time() - ttl
+    return (
+        _query("DELETE FROM forward_cache WHERE created_at<?", (cutoff,), path, write=True)
+        + _query("DELETE FROM reverse_cache WHERE created_at<?", (cutoff,), path, write=True)
+    )
+
+def invalidate(path=None):
+    return (
+        _query("DELETE FROM forward_cache", path=path, write=True)
+        + _query("DELETE FROM reverse_cache", path=path, write=True)
+    )
+
+# ✅ 관리자 명령
+#    python geocode_cache.py stats
+#    python geocode_cache.py purge      # TTL 지난 항목 삭제
+#    python geocode_cache.py invalidate # 전체 삭제
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지오코딩 캐시 관리")
+    parser.add_argument("command", choices=["stats", "purge", "invalidate"])
+    parser.add_argument("--path", help="캐시 파일 경로", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        counts = entry_counts(args.path)
+        print(f"주소→좌표 {counts['forward']}건, 좌표→주소 {counts['reverse']}건")
+    elif args.command == "purge":
+        print(f"🗑️ 만료 {purge_expired(path=args.path)}건 삭제")
+    else:
+        print(f"🗑️ {invalidate(args.path)}건 삭제")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
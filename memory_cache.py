@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# memory_cache.py
+# ✅ 프로세스 메모리 LRU 보관소 (크기 상한, 스레드 안전)
+#    세션 간에 공유하는 결과·체크포인트 메모에 공통 사용 → 가장 오래 안 쓴 항목부터 버림
+
+import threading
+from collections import OrderedDict
+
+class BoundedLRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    # 조회 시 최근 사용으로 갱신, 없으면 default
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    # 없으면 factory()로 만들어 등록 (확인과 등록을 한 번의 잠금 안에서)
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = factory()
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# regex_cache.py
+# ✅ GPT로 생성한 검증용 정규식을 디스크(SQLite)에 보관하여 세션/사용자 간 공유
+#    키: (표준명, 컬럼명, 설명+표현형식 해시) → 설명이 바뀌면 자동으로 새 키가 됨
+
+import os
+import sqlite3
+import hashlib
+import threading
+import argparse
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "data", "cache", "regex_cache.sqlite3")
+
+_lock = threading.Lock()
+
+def description_hash(description, expression):
+    text = f"{description or ''}\n{expression or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def _connect(path=None):
+    path = path or CACHE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS regex_cache (
+            standard   TEXT NOT NULL,
+            column     TEXT NOT NULL,
+            desc_hash  TEXT NOT NULL,
+            regex      TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (standard, column, desc_hash)
+        )
+    """)
+    return conn
+
+# ✅ 캐시 조회 (없으면 None)
+def get_cached_regex(standard, column, description, expression, path=None):
+    key = (standard or "", column, description_hash(description, expression))
+    with _lock:
+        conn = _connect(path)
+        try:
+            row = conn.execute(
+                "SELECT regex FROM regex_cache WHERE standard=? AND column=? AND desc_hash=?", key
+            ).fetchone()
+        finally:
+            conn.close()
+    return row[0] if row else None
+
+# ✅ 캐시 저장 (같은 키는 덮어씀)
+def put_cached_regex(standard, column, description, expression, regex, path=None):
+    key = (standard or "", column, description_hash(description, expression))
+    with _lock:
+        conn = _connect(path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO regex_cache VALUES (?, ?, ?, ?, ?)",
+                    key + (regex, datetime.now().isoformat(timespec="seconds")),
+                )
+        finally:
+            conn.close()
+
+# ✅ 캐시 무효화 (표준/컬럼 미지정 시 전체 삭제) → 삭제 건수 반환
+def invalidate(standard=None, column=None, path=None):
+    query, params = "DELETE FROM regex_cache WHERE 1=1", []
+    if standard:
+        query += " AND standard=?"
+        params.append(standard)
+    if column:
+        query += " AND column=?"
+        params.append(column)
+    with _lock:
+        conn = _connect(path)
+        try:
+            with conn:
+                return conn.execute(query, params).rowcount
+        finally:
+            conn.close()
+
+def list_entries(standard=None, path=None):
+    query, params = "SELECT standard, column, desc_hash, regex, created_at FROM regex_cache", []
+    if standard:
+        query += " WHERE standard=?"
+        params.append(standard)
+    query += " ORDER BY standard, column"
+    with _lock:
+        conn = _connect(path)
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+# ✅ 관리자 명령
+#    python regex_cache.py list [--standard CCTV]
+#    python regex_cache.py invalidate [--standard CCTV] [--column 관리기관명]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GPT 정규식 캐시 관리")
+    parser.add_argument("command", choices=["list", "invalidate"])
+    parser.add_argument("--standard", help="표준명 (예: CCTV)")
+    parser.add_argument("--column", help="컬럼명 (공백 제거된 이름)")
+    parser.add_argument("--path", help="캐시 파일 경로", default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        rows = list_entries(args.standard, args.path)
+        for standard, column, desc_hash, regex, created_at in rows:
+            print(f"{standard}\t{column}\t{desc_hash}\t{created_at}\t{regex}")
+        print(f"총 {len(rows)}건")
+    else:
+        count = invalidate(args.standard, args.column, args.path)
+        print(f"🗑️ {count}건 삭제")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# regex_inference.py
+# ✅ 표현형식 예시 + 컬럼명으로 검증용 정규식을 로컬에서 결정적으로 추론 (GPT 호출 없음)
+#    날짜/시각, 전화번호, 좌표, 숫자, 코드, 우편번호, 주소, URL/이메일, '+' 구분 목록을 처리하고
+#    자유 텍스트 등 나머지는 None → GPT 생성 대상으로 남김
+#
+#    python regex_inference.py            # 전체 카탈로그 추론 현황
+#    python regex_inference.py --leftover # GPT가 필요한 컬럼 목록
+
+import os
+import re
+import sys
+import json
+import argparse
+from collections import Counter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+META_DIR = os.path.join(BASE_DIR, "meta_dicts_final_clean")
+
+MONTH = r"(0[1-9]|1[0-2])"
+DAY = r"(0[1-9]|[12]\d|3[01])"
+TIME = r"([01]?\d|2[0-4]):[0-5]\d(:[0-5]\d)?"
+PHONE = r"(0\d{1,3}-\d{3,4}-\d{4}|1\d{3}-\d{4})"
+DECIMAL = r"-?\d+(\.\d+)?"
+
+DATE_RE = re.compile(r"(\d{4})([-./]?)(\d{2})\2(\d{2})")
+MONTH_RE = re.compile(r"(\d{4})([-./])(\d{2})")
+TIME_RE = re.compile(r"\d{1,2}:\d{2}(:\d{2})?")
+PHONE_RE = re.compile(PHONE)
+EXAMPLE_SPLIT_RE = re.compile(r"(?:예시?\s*)?\d+\)\s*")
+DECIMAL_RE = re.compile(r"-?\d+\.\d+")
+CODE_RE = re.compile(r"[A-Za-z0-9]+([-_][A-Za-z0-9]+)*")
+HANGUL_RE = re.compile(r"[가-힣]")
+
+PHONE_COLUMNS = ("전화", "팩스", "연락처")
+DATE_COLUMNS = ("일자", "날짜", "일시", "시점")
+TIME_COLUMNS = ("시각", "시간")
+CODE_COLUMNS = ("코드", "번호", "ID")
+COUNT_COLUMNS = ("수", "인원")
+MEASURE_COLUMNS = ("면적", "금액", "요금", "가격", "길이", "폭", "높이", "용량", "율")
+
+def _date_regex(separator, with_time=False):
+    sep = re.escape(separator)
+    regex = rf"\d{{4}}{sep}{MONTH}{sep}{DAY}"
+    return regex + rf"( {TIME})?" if with_time else regex
+
+def _code_shape(example):
+    # 영문 대문자/소문자/숫자 구간은 길이 가변, 구분자(-, _)는 그대로 유지
+    parts = []
+    for run in re.findall(r"[A-Z]+|[a-z]+|\d+|[-_]", example):
+        if run[0].isdigit():
+            shape = r"\d+"
+        elif run[0].isupper():
+            shape = "[A-Z]+"
+        elif run[0].isalpha():
+            shape = "[a-z]+"
+        else:
+            shape = re.escape(run)
+        if not parts or parts[-1] != shape:
+            parts.append(shape)
+    return "".join(parts)
+
+def _numeric_regex(example, column):
+    if "위도" in column:
+        return r"-?\d{1,2}(\.\d+)?" if abs(float(example)) <= 90 else DECIMAL
+    if "경도" in column:
+        return r"-?\d{1,3}(\.\d+)?" if abs(float(example)) <= 180 else DECIMAL
+    if DECIMAL_RE.fullmatch(example):
+        return DECIMAL
+    if column.endswith(CODE_COLUMNS + COUNT_COLUMNS) or (len(example) > 1 and example.startswith("0")):
+        return r"\d+"                 # 코드/개수: 앞자리 0 허용, 부호/소수점 없음
+    return DECIMAL                    # 측정값은 예시가 정수여도 소수 허용
+
+# ✅ 표현형식 예시 기반 분류 → (정규식, 분류)
+def _infer_from_example(example, column):
+    match = DATE_RE.fullmatch(example)
+    if match:
+        return _date_regex(match.group(2)), "날짜"
+    if DATE_RE.match(example) and TIME_RE.fullmatch(example[DATE_RE.match(example).end():].strip()):
+        return _date_regex(DATE_RE.match(example).group(2), with_time=True), "일시"
+    if MONTH_RE.fullmatch(example):
+        return rf"\d{{4}}{re.escape(MONTH_RE.fullmatch(example).group(2))}{MONTH}", "연월"
+    if TIME_RE.fullmatch(example):
+        return TIME, "시각"
+    if PHONE_RE.fullmatch(example):
+        return PHONE, "전화번호"
+    if re.fullmatch(r"\d{3}-\d{2}-\d{5}", example):
+        return r"\d{3}-\d{2}-\d{5}", "사업자등록번호"
+    if "우편번호" in column and re.fullmatch(r"\d{5}|\d{3}-\d{3}", example):
+        return r"\d{5}|\d{3}-\d{3}", "우편번호"
+    if column.endswith("지번") and re.fullmatch(r"(산\s?)?\d+(-\d+)?", example):
+        return r"(산\s?)?\d+(-\d+)?", "지번"
+    if re.fullmatch(DECIMAL, example):
+        return _numeric_regex(example, column), "좌표" if ("위도" in column or "경도" in column) else "숫자"
+    if re.match(r"https?://", example) or "홈페이지" in column:
+        return r"(https?://)?[^\s/]+\.[^\s]+", "URL"
+    if "이메일" in column or re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", example):
+        return r"[^@\s]+@[^@\s]+\.[^@\s]+", "이메일"
+    if "주소" in column and HANGUL_RE.match(example):
+        return r"[가-힣]+(\s+\S+)+", "주소"
+    if CODE_RE.fullmatch(example) and not example.isalpha() and column.endswith(CODE_COLUMNS):
+        return _code_shape(example), "코드"
+    if "+" in example.strip("+"):
+        return r"[^+\s][^+]*(\+[^+\s][^+]*)*", "목록"
+    return None, None
+
+# ✅ 예시가 없을 때 컬럼명만으로 분류
+def _infer_from_column(column):
+    if column.endswith(DATE_COLUMNS):
+        return _date_regex("-"), "날짜"
+    if column.endswith(TIME_COLUMNS) and "시간" not in column[:-2]:
+        return TIME, "시각"
+    if any(word in column for word in PHONE_COLUMNS) and "번호" in column:
+        return PHONE, "전화번호"
+    if "위도" in column:
+        return r"-?\d{1,2}(\.\d+)?", "좌표"
+    if "경도" in column:
+        return r"-?\d{1,3}(\.\d+)?", "좌표"
+    if "우편번호" in column:
+        return r"\d{5}|\d{3}-\d{3}", "우편번호"
+    if column.endswith(COUNT_COLUMNS):
+        return r"\d+", "숫자"
+    if column.endswith(MEASURE_COLUMNS):
+        return DECIMAL, "숫자"
+    return None, None
+
+# ✅ "예시1) A 예시2) B" 형태는 예시별로 추론 → 모두 추론되면 정규식을 OR로 결합
+def split_examples(expression):
+    parts = [p.strip() for p in EXAMPLE_SPLIT_RE.split(expression)]
+    return [p for p in parts if p] if len(parts) > 1 else [expression]
+
+def infer_regex(column, expression=None):
+    column = str(column or "").strip().replace(" ", "")
+    expression = " ".join(str(expression or "").split())
+    if not expression:
+        return _infer_from_column(column)
+
+    regexes, categories = [], []
+    for example in split_examples(expression):
+        regex, category = _infer_from_example(example, column)
+        # 추론 결과는 반드시 예시와 일치해야 채택 (예시 하나라도 실패하면 GPT 대상)
+        if not regex or not re.fullmatch(regex, example):
+            return None, None
+        if regex not in regexes:
+            regexes.append(regex)
+            categories.append(category)
+    if len(regexes) == 1:
+        return regexes[0], categories[0]
+    return "|".join(f"({regex})" for regex in regexes), categories[0]
+
+# ✅ 메타 사전의 설명 전용 컬럼(정규식/허용값 없음)에 추론 정규식 채움 → 채운 컬럼 수
+INFERRED_SOURCE = "추론"
+
+def apply_inferred_regexes(meta):
+    filled = 0
+    for col, meta_col in meta.items():
+        if not isinstance(meta_col, dict):
+            continue
+        if meta_col.get("정규식") or meta_col.get("허용값") or not meta_col.get("설명"):
+            continue
+        regex, category = infer_regex(col, meta_col.get("표현형식"))
+        if regex:
+            meta_col["정규식"] = regex
+            meta_col["정규식출처"] = INFERRED_SOURCE
+            meta_col["추론분류"] = category
+            filled += 1
+    return filled
+
+def catalog_inference_report(meta_dir=META_DIR):
+    categories, leftovers, targets = Counter(), [], 0
+    for name in sorted(os.listdir(meta_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(meta_dir, name), encoding="utf-8") as f:
+            meta = {k.strip().replace(" ", ""): v for k, v in json.load(f).items()}
+        for col, meta_col in meta.items():
+            if not isinstance(meta_col, dict) or meta_col.get("정규식") or meta_col.get("허용값") or not meta_col.get("설명"):
+                continue
+            targets += 1
+            regex, category = infer_regex(col, meta_col.get("표현형식"))
+            if regex:
+                categories[category] += 1
+            else:
+                leftovers.append((name[:-len(".json")], col, meta_col.get("표현형식")))
+    return targets, categories, leftovers
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="표현형식 기반 로컬 정규식 추론 현황")
+    parser.add_argument("--leftover", action="store_true", help="추론하지 못한(GPT 필요) 컬럼 목록 출력")
+    args = parser.parse_args(argv)
+
+    targets, categories, leftovers = catalog_inference_report()
+    inferred = sum(categories.values())
+    print(f"설명 전용 컬럼 {targets}개 중 {inferred}개 추론 ({inferred / max(targets, 1):.1%}), GPT 필요 {len(leftovers)}개")
+    for category, count in categories.most_common():
+        print(f"  {category}\t{count}")
+    if args.leftover:
+        for standard, col, expression in leftovers:
+            print(f"{standard}\t{col}\t{expression}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# validator_benchmark.py
+# ✅ 공공데이터 검증기 처리량 벤치마크 (헤드리스 실행)
+#    - 표준별 합성 CSV 생성 (컴파일된 규칙을 통과하는 정상값 + 지정 비율 오류 주입)
+#    - 엔진별 처리속도(행/초), 최대 메모리, 엔진 간·주입 대비 오류 건수 일치 여부 보고
+#    - GPT 정규식 생성은 로컬 스텁으로 대체 (네트워크/디스크 캐시 미사용)
+#
+#    python validator_benchmark.py --standard CCTV --rows 1000 100000 1000000 --output bench.json
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import data_validator_app as validator
+from regex_inference import split_examples
+
+DEFAULT_ROWS = [1_000, 100_000, 1_000_000]
+VALUE_POOL_SIZE = 50
+INVALID_VALUE = "@@오류@@"
+
+# ─────────────────────────────────────────────
+# ✅ 합성 데이터 생성
+# ─────────────────────────────────────────────
+def _char_shape(ch):
+    if ch.isdigit():
+        return r"\d"
+    if "가" <= ch <= "힣":
+        return "[가-힣]"
+    if ch.isascii() and ch.isalpha():
+        return "[A-Za-z]"
+    return re.escape(ch)
+
+# ✅ 표현형식 예시 → 문자 종류별 형태 정규식 (스텁 GPT 응답으로 사용)
+def shape_regex(expression):
+    if not expression:
+        return r".+"
+    parts = []
+    for ch in str(expression).strip():
+        shape = _char_shape(ch)
+        if parts and parts[-1][0] == shape:
+            parts[-1][1] += 1
+        else:
+            parts.append([shape, 1])
+    return "".join(f"{shape}+" if shape.startswith(("\\d", "[")) else shape * count for shape, count in parts)
+
+# ✅ 표현형식 예시의 숫자/한글/영문을 같은 종류의 임의 문자로 바꿔 정상값 생성
+def mutate_expression(expression, rng):
+    out = []
+    for ch in str(expression).strip():
+        if ch.isdigit():
+            out.append(str(rng.randint(0, 9)))
+        elif "가" <= ch <= "힣":
+            out.append(chr(rng.randint(ord("가"), ord("힣"))))
+        elif ch.isascii() and ch.isalpha():
+            letter = chr(rng.randint(ord("a"), ord("z")))
+            out.append(letter.upper() if ch.isupper() else letter)
+        else:
+            out.append(ch)
+    return "".join(out)
+
+# ✅ 정상값 풀: 컴파일된 규칙을 실제로 통과하는 값만 사용
+#    정규식 컬럼은 표현형식 예시·변형값 + 패턴 구조 기반 일치 표본 중 fullmatch 되는 값만 채택
+def valid_value_pool(meta_col, rule, rng):
+    expression = meta_col.get("표현형식")
+    if rule["kind"] == "allowed":
+        candidates = [str(v).strip() for v in meta_col.get("허용값") or []]
+    else:
+        candidates = split_examples(" ".join(str(expression).split())) if expression else []
+        candidates += [mutate_expression(expression, rng) for _ in range(VALUE_POOL_SIZE)] if expression else ["샘플"]
+        if rule["kind"] == "regex" and rule["pattern"] is not None:
+            candidates += validator.positive_samples(rule["pattern"], expression, VALUE_POOL_SIZE, rng.randrange(2 ** 32))
+    # 검증기는 앞뒤 공백을 뗀 값으로 판정하므로 같은 기준으로 정리
+    pool = [value for value in dict.fromkeys(v.strip() for v in candidates) if value and value.upper() not in validator.EMPTY_TOKENS]
+    if rule["kind"] == "regex":
+        if rule["pattern"] is None:
+            return []
+        pool = [value for value in pool if rule["pattern"].fullmatch(value)]
+    return pool
+
+# ✅ 검출되는 오류값: 필수 컬럼은 빈값, 그 외는 규칙을 통과하지 못하는 값 (규칙 없이 통과하면 None → 주입 안 함)
+def invalid_value(meta_col, rule):
+    if rule["required"]:
+        return ""                  # 필수값 누락
+    if rule["kind"] == "allowed" and INVALID_VALUE not in rule["allowed"]:
+        return INVALID_VALUE       # 허용값 오류
+    if rule["kind"] == "regex" and rule["pattern"] is not None and not rule["pattern"].fullmatch(INVALID_VALUE):
+        return INVALID_VALUE       # 형식 오류
+    return None
+
+# ✅ 합성 DataFrame: 컬럼별 정상값 풀에서 추출 후 error_rate 비율로 오류 주입
+#    정상값을 만들 수 없는 컬럼은 제외하고 (제외 컬럼 목록으로) 반환
+def build_synthetic_frame(meta, rules, rows, error_rate=0.05, seed=0):
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    data, skipped = {}, []
+    injected = 0
+    for col, meta_col in meta.items():
+        rule = rules.get(col)
+        if not isinstance(meta_col, dict) or rule is None:
+            continue
+        pool = valid_value_pool(meta_col, rule, rng)
+        if not pool:
+            skipped.append(col)
+            continue
+        values = np.array(pool, dtype=object)[np_rng.integers(0, len(pool), size=rows)]
+        bad = invalid_value(meta_col, rule)
+        if bad is not None:
+            mask = np_rng.random(rows) < error_rate
+            values[mask] = bad
+            injected += int(mask.sum())
+        data[col] = values
+    return pd.DataFrame(data), injected, skipped
+
+def write_synthetic_csv(meta, rules, rows, path, error_rate=0.05, seed=0):
+    df, injected, skipped = build_synthetic_frame(meta, rules, rows, error_rate, seed)
+    df.to_csv(path, index=False, encoding="utf-8")
+    return injected, skipped
+
+# ─────────────────────────────────────────────
+# ✅ GPT 정규식 생성 스텁 (표현형식 형태 정규식 반환, 캐시는 메모리)
+# ─────────────────────────────────────────────
+def stub_regex_generation():
+    store = {}
+    validator.request_regex_from_gpt = lambda description, expression, column_name, client=None: shape_regex(expression)
+    validator.generate_regex_from_description = lambda description, expression, column_name: shape_regex(expression)
+    validator.get_cached_regex = lambda standard, column, description, expression: store.get((standard, column))
+    validator.put_cached_regex = lambda standard, column, description, expression, regex: store.__setitem__((standard, column), regex)
+
+# ─────────────────────────────────────────────
+# ✅ 엔진 실행 및 측정
+# ─────────────────────────────────────────────
+class _CsvFile:
+    # validate_csv_stream이 기대하는 업로드 파일 인터페이스 (seek/tell/read + size)
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self.size = os.path.getsize(path)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def close(self):
+        self._f.close()
+
+def _measure(fn, memory=True):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def _fresh_meta(standard):
+    meta = validator.load_meta_dict(standard)
+    validator.prefetch_generated_regexes(standard, meta)
+    return meta, validator.get_standard_rules(standard, meta)
+
+def run_engine(engine, standard, csv_path, rows, memory=True, workers=1):
+    meta, rules = _fresh_meta(standard)
+    if engine == "streaming":
+        def fn():
+            f = _CsvFile(csv_path)
+            try:
+                return len(validator.validate_csv_stream(f, validator.detect_file_encoding(f), meta, rules, standard)[0])
+            finally:
+                f.close()
+    else:
+        df = validator.normalize_columns(pd.read_csv(csv_path, dtype=str, nrows=rows).fillna(""))
+        if engine == "vectorized":
+            fn = lambda: len(validator.validate_dataframe(df, meta, rules, standard))
+        elif engine == "parallel":
+            fn = lambda: len(validator.validate_dataframe_parallel(df, meta, rules, standard, workers))
+        else:
+            fn = lambda: len(validator.run_cell_validation(df, meta, standard))
+
+    errors, elapsed, peak = _measure(fn, memory)
+    return {
+        "엔진": engine,
+        "행수": rows,
+        "오류수": errors,
+        "소요(초)": round(elapsed, 3),
+        "행/초": round(rows / elapsed) if elapsed else None,
+        "최대메모리(MB)": round(peak / 1024 / 1024, 1) if peak is not None else None,
+    }
+
+def benchmark_standard(standard, sizes, error_rate=0.05, cell_max_rows=10_000, memory=True, workdir=None, seed=0, workers=1):
+    if validator.load_meta_dict(standard) is None:
+        raise ValueError(f"표준을 찾을 수 없습니다: {standard}")
+    meta, rules = _fresh_meta(standard)
+
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for rows in sizes:
+            csv_path = os.path.join(tmp, f"{standard}_{rows}.csv")
+            injected, skipped = write_synthetic_csv(meta, rules, rows, csv_path, error_rate, seed)
+            if skipped:
+                print(f"ℹ️ {standard}: 정상값을 만들 수 없어 제외한 컬럼 {', '.join(skipped)}")
+
+            vectorized = run_engine("vectorized", standard, csv_path, rows, memory)
+            streaming = run_engine("streaming", standard, csv_path, rows, memory)
+            cell_rows = min(rows, cell_max_rows)
+            cell = run_engine("cell", standard, csv_path, cell_rows, memory)
+            cell_reference = (
+                vectorized["오류수"] if cell_rows == rows
+                else run_engine("vectorized", standard, csv_path, cell_rows, memory=False)["오류수"]
+            )
+
+            engines = [vectorized, streaming, cell]
+            vectorized["일치"] = vectorized["오류수"] == streaming["오류수"]
+            streaming["일치"] = vectorized["일치"]
+            cell["일치"] = cell["오류수"] == cell_reference
+            if workers > 1:
+                # 병렬 엔진은 워커 프로세스 메모리가 tracemalloc에 잡히지 않으므로 시간만 측정
+                parallel = run_engine("parallel", standard, csv_path, rows, memory=False, workers=workers)
+                parallel["일치"] = parallel["오류수"] == vectorized["오류수"]
+                engines.append(parallel)
+
+            for r in engines:
+                # 셀 단위 엔진은 앞쪽 행만 측정하므로 전체 행일 때만 주입 건수와 비교
+                r.update({"표준": standard, "주입오류수": injected,
+                          "주입일치": r["오류수"] == injected if r["행수"] == rows else None})
+            results.extend(engines)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공공데이터 검증기 처리량 벤치마크")
+    parser.add_argument("--standard", nargs="+", default=["CCTV"], help="표준명 (meta_dicts_final_clean 파일명)")
+    parser.add_argument("--rows", nargs="+", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--cell-max-rows", type=int, default=10_000, help="셀 단위 엔진은 앞쪽 N행만 측정")
+    parser.add_argument("--no-memory", action="store_true", help="최대 메모리 측정 생략 (측정 시 엔진을 한 번 더 실행)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="2 이상이면 멀티프로세스 엔진도 측정")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (회귀 추적용)")
+    args = parser.parse_args(argv)
+
+    # ✅ ReDoS 프로파일러가 알려진 위험 패턴을 놓치면 측정 전에 실패 처리
+    missed = validator.profiler_self_check()
+    if missed:
+        print(f"❌ 정규식 프로파일러 자가 점검 실패 (안전으로 판정된 위험 패턴): {missed}")
+        return 1
+
+    stub_regex_generation()
+    results = []
+    for standard in args.standard:
+        results.extend(benchmark_standard(
+            standard, args.rows, args.error_rate, args.cell_max_rows, not args.no_memory,
+            seed=args.seed, workers=args.workers
+        ))
+
+    columns = ["표준", "엔진", "행수", "주입오류수", "오류수", "주입일치", "일치", "소요(초)", "행/초", "최대메모리(MB)"]
+    print(pd.DataFrame(results)[columns].to_string(index=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+
+    # ✅ 엔진 간 오류 건수가 다르거나, 오류 비율 0인데 오류가 검출되면 실패 코드 반환 (CI 회귀 감지용)
+    consistent = all(r["일치"] for r in results)
+    clean = args.error_rate > 0 or all(r["주입일치"] is not False for r in results)
+    return 0 if consistent and clean else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# validator_cli.py
+# ✅ 공공데이터 일괄 검증 CLI (야간 정기 검증용, Streamlit 없이 실행)
+#    - 디렉토리의 CSV를 매핑된 표준(또는 헤더 기반 자동 추천 표준)으로 병렬 검증
+#    - 파일별 오류 리포트(JSON/CSV) + 전체 요약(summary.json / summary.csv) 저장
+#    - 종료 코드: 0 = 전체 통과, 1 = 오류 있는 파일 존재, 2 = 처리 실패/표준 미지정 파일 존재
+#
+#    python validator_cli.py ./opendata --mapping mapping.json --output ./reports --jobs 4
+
+import os
+import sys
+import json
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import data_validator_app as validator
+
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_FAILED = 2
+
+# ✅ 매핑 파일: JSON {"파일명 또는 확장자 뺀 이름": "표준명"} 또는 CSV (파일, 표준 컬럼)
+def load_mapping(path):
+    if not path:
+        return {}
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    with open(path, "rb") as f:
+        encoding = validator.detect_file_encoding(f)
+        df = pd.read_csv(f, dtype=str, encoding=encoding)
+    return dict(zip(df["파일"].str.strip(), df["표준"].str.strip()))
+
+def discover_files(input_dir, pattern="*.csv", recursive=False):
+    pattern = os.path.join(input_dir, "**", pattern) if recursive else os.path.join(input_dir, pattern)
+    return sorted(glob.glob(pattern, recursive=recursive))
+
+# ✅ 파일별 표준 결정: 매핑(파일명 → 확장자 뺀 이름) → 공통 표준 → 헤더 기반 추천 1순위 (점수 기준 이상일 때만)
+def resolve_standard(path, mapping, min_score=validator.SUGGEST_MIN_SCORE, default=None):
+    name = os.path.basename(path)
+    standard = mapping.get(name) or mapping.get(os.path.splitext(name)[0])
+    if standard:
+        return standard, "매핑"
+    if default:
+        return default, "공통 표준"
+    with open(path, "rb") as f:
+        header = validator.read_csv_header(f, validator.detect_file_encoding(f))
+    suggestions = validator.suggest_standards(header, top_n=1)
+    if suggestions and suggestions[0]["점수"] >= min_score:
+        return suggestions[0]["표준"], f"자동추천({suggestions[0]['점수']:.2f})"
+    return None, "표준 미지정"
+
+def _report_path(output_dir, path, ext):
+    return os.path.join(output_dir, f"{os.path.splitext(os.path.basename(path))[0]}_오류.{ext}")
+
+def write_file_report(errors, path, standard, total_rows, output_dir, fmt):
+    written = []
+    if fmt in ("csv", "both"):
+        report = _report_path(output_dir, path, "csv")
+        with open(report, "wb") as f:
+            f.write(validator.export_error_report(errors, "CSV"))
+        written.append(report)
+    if fmt in ("json", "both"):
+        report = _report_path(output_dir, path, "json")
+        summary = errors.groupby(["컬럼", "오류"]).size()
+        payload = {
+            "파일": os.path.basename(path),
+            "표준": standard,
+            "행수": total_rows,
+            "오류셀수": len(errors),
+            "요약": [{"컬럼": c, "오류": m, "건수": int(n)} for (c, m), n in summary.items()],
+            "오류": errors.to_dict(orient="records"),
+        }
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2, default=int)
+        written.append(report)
+    return written
+
+# ✅ 파일 1개 검증 (워커 프로세스에서 실행)
+def validate_file(task):
+    path, standard, meta, skip_columns, options = task
+    result = {"파일": os.path.basename(path), "표준": standard, "인코딩": None, "행수": 0,
+              "오류셀수": 0, "오류행수": 0, "검사생략셀수": 0, "상태": "실패", "메시지": "", "보고서": []}
+    try:
+        rules = validator.get_standard_rules(standard, meta)
+        for col in skip_columns:
+            if col in rules:
+                rules[col]["kind"] = None   # 오프라인 모드: 캐시에 정규식 없는 설명 컬럼은 형식 검사 생략
+
+        with open(path, "rb") as f:
+            encoding = validator.detect_file_encoding(f)
+            header = validator.read_csv_header(f, encoding)
+            key_columns = validator.detect_key_columns(header, meta, standard) if options["check_keys"] else None
+            table_rules = validator.compile_table_rules(
+                header, key_columns, options["check_regions"], options["check_coordinates"], meta
+            )
+            errors, total_rows, encoding = validator.validate_csv_stream(
+                f, encoding, meta, rules, standard, chunksize=options["chunksize"], table_rules=table_rules
+            )
+
+        result.update({
+            "인코딩": encoding,
+            "행수": total_rows,
+            "오류셀수": len(errors),
+            "오류행수": int(errors["행"].nunique()),
+            "검사생략셀수": sum(validator.skipped_cells(rules).values()),   # 정규식 시간 예산 초과
+            "상태": "오류" if len(errors) else "통과",
+            "보고서": write_file_report(errors, path, standard, total_rows, options["output"], options["format"]),
+        })
+    except Exception as e:
+        result["메시지"] = f"{type(e).__name__}: {e}"
+    return result
+
+def write_summary(results, output_dir):
+    summary = pd.DataFrame(results)
+    summary["보고서"] = summary["보고서"].map(lambda paths: ";".join(paths))
+    summary.to_csv(os.path.join(output_dir, "summary.csv"), index=False, encoding="utf-8-sig")
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return summary
+
+def exit_code_of(results):
+    if any(r["상태"] == "실패" for r in results):
+        return EXIT_FAILED
+    if any(r["상태"] == "오류" for r in results):
+        return EXIT_ERRORS
+    return EXIT_OK
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공공데이터 일괄 검증 (헤드리스)")
+    parser.add_argument("input_dir", help="검증할 CSV 디렉토리")
+    parser.add_argument("--mapping", help="파일 → 표준 매핑 (JSON 또는 CSV: 파일, 표준)")
+    parser.add_argument("--standard", help="매핑에 없는 파일에 적용할 표준 (미지정 시 헤더로 자동 추천)")
+    parser.add_argument("--output", default="validation_reports", help="리포트 저장 디렉토리")
+    parser.add_argument("--format", choices=["csv", "json", "both"], default="both")
+    parser.add_argument("--pattern", default="*.csv")
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="동시에 검증할 파일 수")
+    parser.add_argument("--min-score", type=float, default=validator.SUGGEST_MIN_SCORE, help="자동 추천 표준 채택 최소 점수")
+    parser.add_argument("--chunksize", type=int, default=validator.STREAMING_CHUNK_ROWS)
+    parser.add_argument("--check-keys", action="store_true", help="관리번호 등 키 컬럼 중복 검사")
+    parser.add_argument("--check-regions", action="store_true", help="시도/시군구 참조 검사 (시도명·시도-시군구 불일치, 시군구 목록이 일부만 수록되면 소속 검사는 꺼짐)")
+    parser.add_argument("--check-coordinates", action="store_true", help="위도/경도 범위 검사 (국외·뒤바뀜·신고 지역 밖)")
+    parser.add_argument("--offline", action="store_true", help="GPT 호출 없이 정규식 캐시만 사용")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    mapping = load_mapping(args.mapping)
+    files = discover_files(args.input_dir, args.pattern, args.recursive)
+    if not files:
+        print(f"❌ 검증할 파일이 없습니다: {args.input_dir}")
+        return EXIT_FAILED
+
+    if args.check_regions and not validator.region_membership_check_enabled():
+        print("ℹ️ 시군구 참조 목록이 일부만 수록되어 있어 시군구명 소속(목록에 없는 이름) 검사는 꺼져 있습니다.")
+
+    options = {
+        "output": args.output, "format": args.format, "chunksize": args.chunksize,
+        "check_keys": args.check_keys, "check_regions": args.check_regions,
+        "check_coordinates": args.check_coordinates,
+    }
+
+    # ✅ 표준 결정 후, 표준별로 GPT 정규식을 1회만 준비 (워커에서는 네트워크 호출 없음)
+    results, tasks, prepared = [], [], {}
+    for path in files:
+        try:
+            standard, source = resolve_standard(path, mapping, args.min_score, args.standard)
+        except Exception as e:
+            standard, source = None, f"헤더 읽기 실패: {e}"
+        meta = validator.load_meta_dict(standard) if standard else None
+        if meta is None:
+            results.append({"파일": os.path.basename(path), "표준": standard, "인코딩": None, "행수": 0,
+                            "오류셀수": 0, "오류행수": 0, "검사생략셀수": 0, "상태": "실패", "메시지": source if not standard else "메타 정보 없음", "보고서": []})
+            continue
+        if standard not in prepared:
+            prefetch = validator.prefetch_generated_regexes(standard, meta, generate=not args.offline)
+            for col, err in prefetch["실패"].items():
+                print(f"❗ 정규식 생성 실패 ({standard}/{col}): {err}")
+            prepared[standard] = (meta, prefetch["미생성"])
+        meta, skip_columns = prepared[standard]
+        tasks.append((path, standard, meta, skip_columns, options))
+
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results.extend(pool.map(validate_file, tasks))
+    else:
+        results.extend(validate_file(task) for task in tasks)
+
+    summary = write_summary(results, args.output)
+    print(summary[["파일", "표준", "행수", "오류셀수", "검사생략셀수", "상태", "메시지"]].to_string(index=False))
+    return exit_code_of(results)
+
+if __name__ == "__main__":
+    sys.exit(main())